@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the F1 API hot paths, run offline against a replay bundle
+Reports p50/p95/p99 and throughput per stage and compares them with a stored
+baseline, exiting non-zero when a stage got slower than the tolerance allows
+"""
+
+import argparse
+import asyncio
+import atexit
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_BASELINE = "bench_baseline.json"
+
+
+def summarize(samples: List[float], elapsed: Optional[float] = None) -> Dict[str, float]:
+    """Latency percentiles in ms; throughput is ops/s over elapsed (default: sum of samples)"""
+    q = statistics.quantiles(samples, n=100, method="inclusive") if len(samples) > 1 else samples * 99
+    elapsed = elapsed if elapsed is not None else sum(samples)
+    return {
+        "n": len(samples),
+        "p50Ms": round(q[49] * 1000, 3),
+        "p95Ms": round(q[94] * 1000, 3),
+        "p99Ms": round(q[98] * 1000, 3),
+        "throughput": round(len(samples) / elapsed, 1) if elapsed else 0.0
+    }
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def bench_loaders(sessions: List[Tuple[int, int]], repeat: int) -> Dict[str, Dict[str, float]]:
+    """Session loads, result-table construction and schedule formatting"""
+    import loaders
+    from qualifying import fastest_laps_table, team_color_map
+    from replay import ReplayBundle
+    from result_store import ResultStore
+
+    bundle = loaders.fastf1
+    results = {}
+
+    def cold_load():
+        # A fresh bundle re-reads the manifest and schedule, like a new process
+        for year, round_number in sessions:
+            ReplayBundle(bundle.root).get_session(year, round_number, 'Q').load()
+
+    def warm_load():
+        for year, round_number in sessions:
+            bundle.get_session(year, round_number, 'Q').load()
+
+    results["session.load cold"] = summarize(measure(cold_load, repeat))
+    results["session.load warm"] = summarize(measure(warm_load, repeat))
+
+    loaded = []
+    for year, round_number in sessions:
+        session = bundle.get_session(year, round_number, 'Q')
+        session.load()
+        loaded.append(session)
+
+    def results_table():
+        for session in loaded:
+            fastest_laps = fastest_laps_table(session.laps)
+            fastest_laps['TeamColor'] = fastest_laps['Team'].map(team_color_map(fastest_laps['Team'], session))
+            loaders.build_payload(fastest_laps, session.event['EventName'])
+
+    results["results table"] = summarize(measure(results_table, repeat))
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        store = ResultStore(store_dir)
+
+        def qualifying_cold():
+            # Full load + both result tables + store write, as on a cache miss
+            for year, round_number in sessions:
+                loaders._load_qualifying(year, round_number, store)
+
+        def qualifying_stored():
+            for year, round_number in sessions:
+                loaders.load_stored_qualifying(store, year, round_number)
+
+        results["load_qualifying cold"] = summarize(measure(qualifying_cold, repeat))
+        results["load_qualifying from store"] = summarize(measure(qualifying_stored, repeat))
+
+    years = sorted({year for year, _ in sessions})
+    results["schedule formatting"] = summarize(measure(lambda: [loaders.load_events(y) for y in years], repeat))
+    return results
+
+
+async def bench_requests(sessions: List[Tuple[int, int]], requests: int,
+                         concurrency_levels: List[int]) -> Dict[str, Dict[str, float]]:
+    """End-to-end latency through the ASGI app for cached responses, per concurrency level"""
+    import httpx
+    import main
+
+    year, round_number = sessions[0]
+    paths = {
+        "qualifying": f"/api/f1/qualifying?year={year}&event={round_number}",
+        "events": f"/api/f1/events/{year}",
+        "sectors": f"/api/f1/qualifying/sectors?year={year}&event={round_number}"
+    }
+    results = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # The first request per path pays the load; report it as the cold latency
+        for name, path in paths.items():
+            started = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            results[f"GET {name} cold"] = summarize([time.perf_counter() - started])
+
+        for name, path in paths.items():
+            for concurrency in concurrency_levels:
+                samples: List[float] = []
+                remaining = iter(range(requests))
+
+                async def worker():
+                    for _ in remaining:
+                        started = time.perf_counter()
+                        response = await client.get(path, headers={"Accept-Encoding": "br, gzip"})
+                        response.raise_for_status()
+                        samples.append(time.perf_counter() - started)
+
+                started = time.perf_counter()
+                await asyncio.gather(*(worker() for _ in range(concurrency)))
+                results[f"GET {name} c={concurrency}"] = summarize(samples, time.perf_counter() - started)
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float, min_delta_ms: float) -> List[str]:
+    """
+    Stages whose p95 exceeds the baseline p95 by more than tolerance
+    Differences below min_delta_ms are timer noise on sub-millisecond stages
+    """
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get(name)
+        if base and stats["p95Ms"] > base["p95Ms"] * (1 + tolerance) \
+                and stats["p95Ms"] - base["p95Ms"] >= min_delta_ms:
+            regressions.append(f"{name}: p95 {stats['p95Ms']:.3f} ms vs baseline {base['p95Ms']:.3f} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the F1 API hot paths offline")
+    parser.add_argument("--bundle", default=os.getenv("F1_REPLAY_BUNDLE"),
+                        help="replay bundle recorded with replay.py (default: F1_REPLAY_BUNDLE)")
+    parser.add_argument("--repeat", type=int, default=20, help="samples per loader stage")
+    parser.add_argument("--requests", type=int, default=500, help="requests per endpoint and concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline file to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="write these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p95 slowdown (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5, help="ignore p95 slowdowns smaller than this")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    if not args.bundle:
+        parser.error("a replay bundle is required; record one with: python replay.py --bundle DIR --season YEAR")
+    baseline_path = os.path.abspath(args.baseline)
+    json_path = os.path.abspath(args.json) if args.json else None
+
+    # Loaders pick the data source at import time; run in a scratch directory
+    # so the FastF1 cache, lock files and result store stay out of the tree
+    os.environ["F1_REPLAY_BUNDLE"] = os.path.abspath(args.bundle)
+    workdir = tempfile.mkdtemp(prefix="f1-bench-")
+    atexit.register(shutil.rmtree, workdir, ignore_errors=True)
+    os.environ["F1_RESULT_STORE_DIR"] = os.path.join(workdir, "derived")
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    os.chdir(workdir)
+
+    from replay import ReplayBundle
+    manifest = ReplayBundle(os.environ["F1_REPLAY_BUNDLE"]).manifest
+    sessions = sorted(
+        (int(year), int(key.split("_")[0]))
+        for year, season in manifest["seasons"].items() for key in season["sessions"]
+    )
+    if not sessions:
+        parser.error(f"no sessions in bundle {args.bundle}")
+
+    print(f"📊 F1 API benchmark: {len(sessions)} sessions from {args.bundle}")
+    results = bench_loaders(sessions, args.repeat)
+    results.update(asyncio.run(bench_requests(sessions, args.requests, args.concurrency)))
+
+    print(f"\n{'stage':<32}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ops/s':>10}")
+    for name, stats in results.items():
+        print(f"{name:<32}{stats['n']:>6}{stats['p50Ms']:>10.3f}{stats['p95Ms']:>10.3f}"
+              f"{stats['p99Ms']:>10.3f}{stats['throughput']:>10.1f}")
+
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        with open(baseline_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Baseline saved to {baseline_path}")
+        return 0
+
+    if not os.path.exists(baseline_path):
+        print(f"\nNo baseline at {baseline_path}; run with --save-baseline to create one")
+        return 0
+
+    with open(baseline_path) as f:
+        regressions = compare(results, json.load(f), args.tolerance, args.min_delta_ms)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regressions beyond {args.tolerance:.0%}:")
+        for line in regressions:
+            print(f"   {line}")
+        return 1
+    print(f"\n✅ No regressions beyond {args.tolerance:.0%} of the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
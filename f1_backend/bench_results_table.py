@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the qualifying result-table step
+Compares the old per-driver loop with the vectorized pipeline in qualifying.py
+on a synthetic laps frame, so it runs without network access or a FastF1 cache
+"""
+
+import argparse
+import statistics
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from qualifying import fastest_laps_table, format_results
+
+
+def make_laps(drivers: int = 20, laps_per_driver: int = 15, seed: int = 0) -> pd.DataFrame:
+    """Synthetic qualifying laps with the columns the pipeline reads"""
+    rng = np.random.default_rng(seed)
+    n = drivers * laps_per_driver
+    codes = np.array([f"D{i:02d}" for i in range(drivers)])
+    teams = np.array([f"Team {i // 2}" for i in range(drivers)])
+    driver_idx = np.repeat(np.arange(drivers), laps_per_driver)
+
+    lap_seconds = 88 + driver_idx * 0.05 + rng.random(n) * 3
+    lap_times = pd.Series(pd.to_timedelta(lap_seconds, unit="s"))
+    # Out-laps, in-laps and aborted laps have no lap time
+    lap_times[rng.random(n) < 0.3] = pd.NaT
+
+    return pd.DataFrame({
+        "Driver": codes[driver_idx],
+        "Team": teams[driver_idx],
+        "LapNumber": np.tile(np.arange(1, laps_per_driver + 1), drivers),
+        "LapTime": lap_times
+    })
+
+
+def legacy_table(laps: pd.DataFrame, team_colors: dict) -> list:
+    """The per-driver filter + iterrows pipeline the API used before"""
+    fastest = []
+    for drv in pd.unique(laps['Driver']):
+        drv_laps = laps[laps['Driver'] == drv].dropna(subset=['LapTime'])
+        if not drv_laps.empty:
+            fastest.append(drv_laps.loc[drv_laps['LapTime'].idxmin()])
+    fastest_laps = pd.DataFrame(fastest).sort_values(by='LapTime').reset_index(drop=True)
+    fastest_laps['LapTimeDelta'] = fastest_laps['LapTime'] - fastest_laps['LapTime'].min()
+
+    colors = []
+    for _, lap in fastest_laps.iterrows():
+        colors.append(team_colors.get(lap['Team'], "#FFFFFF"))
+
+    results = []
+    for idx, lap in fastest_laps.iterrows():
+        delta = lap['LapTimeDelta'].total_seconds()
+        results.append({
+            "position": idx + 1,
+            "driver": lap['Driver'],
+            "team": lap['Team'],
+            "lapTime": str(lap['LapTime']).split()[-1],
+            "timeDelta": f"+{delta:.3f}s" if delta > 0 else "Pole",
+            "teamColor": colors[idx]
+        })
+    return results
+
+
+def vectorized_table(laps: pd.DataFrame, team_colors: dict) -> list:
+    return format_results(fastest_laps_table(laps), team_colors)
+
+
+def bench(fn, laps, team_colors, repeat: int, number: int) -> dict:
+    timings = timeit.repeat(lambda: fn(laps, team_colors), repeat=repeat, number=number)
+    per_call_ms = [t / number * 1000 for t in timings]
+    return {"min": min(per_call_ms), "median": statistics.median(per_call_ms)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the qualifying result-table step")
+    parser.add_argument("--drivers", type=int, default=20)
+    parser.add_argument("--laps", type=int, default=15, help="laps per driver")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    laps = make_laps(args.drivers, args.laps)
+    team_colors = {team: "#FFFFFF" for team in laps['Team'].unique()}
+
+    # Both pipelines must agree before their timings mean anything
+    assert legacy_table(laps, team_colors) == vectorized_table(laps, team_colors)
+
+    print(f"📊 Result table benchmark: {args.drivers} drivers x {args.laps} laps")
+    legacy = bench(legacy_table, laps, team_colors, args.repeat, args.number)
+    vectorized = bench(vectorized_table, laps, team_colors, args.repeat, args.number)
+    print(f"   legacy loop: min {legacy['min']:.3f} ms, median {legacy['median']:.3f} ms")
+    print(f"   vectorized:  min {vectorized['min']:.3f} ms, median {vectorized['median']:.3f} ms")
+    print(f"   speedup:     {legacy['median'] / vectorized['median']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
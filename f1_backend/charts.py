@@ -0,0 +1,79 @@
+"""
+Server-side rendering of the qualifying delta chart from plot_qualifying_results.py
+Runs in a process pool: matplotlib is CPU-heavy and its global state is not thread-safe
+"""
+
+import io
+from typing import Any, Dict, List, Tuple
+
+from lazy import lazy_import
+
+matplotlib = lazy_import("matplotlib")
+
+CHART_FORMATS = {"png": "image/png", "svg": "image/svg+xml"}
+CHART_DPI = 100
+
+
+def init_renderer():
+    """Process pool initializer: headless backend, no display needed"""
+    matplotlib.use("Agg")
+
+
+def _delta_seconds(time_delta: str) -> float:
+    """'+0.123s' -> 0.123, 'Pole' -> 0.0"""
+    return 0.0 if time_delta == "Pole" else float(time_delta.strip("+s"))
+
+
+def _short_lap_time(lap_time: str) -> str:
+    """'00:01:32.123000' -> '1:32.123' (the %m:%s.%ms format of the original plot)"""
+    hours, minutes, seconds = lap_time.split(":")
+    minutes = int(hours) * 60 + int(minutes)
+    return f"{minutes}:{float(seconds):06.3f}"
+
+
+def chart_rows(payload: Dict[str, Any]) -> Tuple[List[str], List[float], List[str]]:
+    """Drivers, deltas to pole in seconds and team colours, fastest first"""
+    results = payload["results"]
+    return (
+        [r["driver"] for r in results],
+        [_delta_seconds(r["timeDelta"]) for r in results],
+        [r["teamColor"] for r in results]
+    )
+
+
+def render_qualifying_chart(payload: Dict[str, Any], fmt: str = "png", width: int = 800, height: int = 600) -> bytes:
+    """Render the qualifying delta bar chart for a /api/f1/qualifying payload"""
+    drivers, deltas, colors = chart_rows(payload)
+    positions = list(range(len(drivers)))
+
+    # The Figure API avoids pyplot's global figure manager
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(width / CHART_DPI, height / CHART_DPI), dpi=CHART_DPI)
+    ax = fig.subplots()
+    ax.barh(positions, deltas, color=colors, edgecolor='grey')
+    ax.set_yticks(positions)
+    ax.set_yticklabels(drivers)
+    ax.set_xlabel("Gap to pole (s)")
+
+    # show fastest at the top
+    ax.invert_yaxis()
+
+    # draw vertical lines behind the bars
+    ax.set_axisbelow(True)
+    ax.xaxis.grid(True, which='major', linestyle='--', color='black', zorder=-1000)
+
+    pole = payload["polePosition"]
+    if pole.get("time"):
+        fig.suptitle(f"{payload['event']} Qualifying\n"
+                     f"Fastest Lap: {_short_lap_time(pole['time'])} ({pole['driver']})")
+
+    buffer = io.BytesIO()
+    if fmt == "svg":
+        # Same payload, same bytes, so ETags stay stable across renders and
+        # workers: no <dc:date> timestamp and no random salt in element ids
+        with matplotlib.rc_context({"svg.hashsalt": "f1-qualifying"}):
+            fig.savefig(buffer, format=fmt, metadata={"Date": None})
+    else:
+        fig.savefig(buffer, format=fmt)
+    return buffer.getvalue()
@@ -0,0 +1,261 @@
+"""
+Size-bounded manager for the FastF1 disk cache
+FastF1 lays sessions out as <cache>/<year>/<date>_<Event_Name>/<date>_<Session>/;
+this keeps that tree under a byte budget by evicting whole events or seasons.
+FastF1's HTTP cache database at the root counts against the budget but is not evicted
+"""
+
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from file_lock import FileLock
+
+logger = logging.getLogger(__name__)
+
+# FastF1's requests-cache database of raw API responses, at the cache root
+# (with -wal/-shm/-journal companions while SQLite has it open)
+HTTP_CACHE_FILE = "fastf1_http_cache.sqlite"
+
+
+def event_dir_name(name: str, date: Optional[str]) -> str:
+    """FastF1's directory name for an event, e.g. 2024-11-23_Las_Vegas_Grand_Prix"""
+    return f"{date}_{name.replace(' ', '_')}"
+
+
+class DiskCacheManager:
+    """Byte budget with LRU eviction per event, age-based eviction per season, and pinning"""
+
+    def __init__(self, root: str, max_bytes: int = 0, pin_seconds: float = 3600, max_age_days: float = 0):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.pin_seconds = pin_seconds
+        self.max_age_days = max_age_days
+        self._lock = threading.Lock()
+        # (year, event dir) -> last time the event was served by this process
+        self._last_served: Dict[Tuple[str, str], float] = {}
+        # (year, event dir) -> [hits, misses] for session loads
+        self._loads: Dict[Tuple[str, str], List[int]] = {}
+        # (year, event name) -> directory name, once it exists on disk
+        self._dir_names: Dict[Tuple[int, str], str] = {}
+        self.evicted_events = 0
+        self.evicted_seasons = 0
+        self.evicted_bytes = 0
+
+    def _event_key(self, year: int, name: str, date: Optional[str]) -> Tuple[str, str]:
+        dir_name = self._dir_names.get((year, name))
+        if dir_name is not None:
+            return str(year), dir_name
+
+        dir_name = event_dir_name(name, date)
+        season_dir = os.path.join(self.root, str(year))
+        if not os.path.isdir(os.path.join(season_dir, dir_name)) and os.path.isdir(season_dir):
+            # Schedule dates can differ from FastF1's EventDate; match on the name
+            suffix = "_" + name.replace(" ", "_")
+            for entry in os.listdir(season_dir):
+                if entry.endswith(suffix):
+                    dir_name = entry
+                    break
+        if os.path.isdir(os.path.join(season_dir, dir_name)):
+            self._dir_names[(year, name)] = dir_name
+        return str(year), dir_name
+
+    def touch(self, year: int, name: str, date: Optional[str]):
+        """Mark an event as recently served, which pins it against eviction"""
+        key = self._event_key(year, name, date)
+        with self._lock:
+            self._last_served[key] = time.time()
+
+    def is_cached(self, year: int, name: str, date: Optional[str]) -> bool:
+        """Whether FastF1 has cached files for the event"""
+        return os.path.isdir(os.path.join(self.root, *self._event_key(year, name, date)))
+
+    def record_load(self, year: int, name: str, date: Optional[str], hit: Optional[bool] = None) -> bool:
+        """
+        Count a session load as a disk hit or miss; pass hit when it was
+        checked before the load ran, otherwise the cache is checked now
+        """
+        key = self._event_key(year, name, date)
+        if hit is None:
+            hit = os.path.isdir(os.path.join(self.root, *key))
+        with self._lock:
+            self._last_served[key] = time.time()
+            counts = self._loads.setdefault(key, [0, 0])
+            counts[0 if hit else 1] += 1
+        return hit
+
+    def http_cache_bytes(self) -> int:
+        """Size of FastF1's HTTP cache database, which counts against the budget but is never evicted"""
+        size = 0
+        if not os.path.isdir(self.root):
+            return size
+        for entry in os.listdir(self.root):
+            if entry.startswith(HTTP_CACHE_FILE):
+                try:
+                    size += os.stat(os.path.join(self.root, entry)).st_size
+                except FileNotFoundError:
+                    continue
+        return size
+
+    def scan(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Walk the cache: {year: {event dir: {bytes, files, lastModified}}}"""
+        seasons: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        if not os.path.isdir(self.root):
+            return seasons
+
+        for year in os.listdir(self.root):
+            season_dir = os.path.join(self.root, year)
+            if not (year.isdigit() and os.path.isdir(season_dir)):
+                continue
+            events = seasons.setdefault(year, {})
+            for event in os.listdir(season_dir):
+                event_dir = os.path.join(season_dir, event)
+                if not os.path.isdir(event_dir):
+                    continue
+                size, files, newest = 0, 0, 0.0
+                for dirpath, _, filenames in os.walk(event_dir):
+                    for filename in filenames:
+                        try:
+                            stat = os.stat(os.path.join(dirpath, filename))
+                        except FileNotFoundError:
+                            continue
+                        size += stat.st_size
+                        files += 1
+                        newest = max(newest, stat.st_mtime)
+                events[event] = {"bytes": size, "files": files, "lastModified": newest}
+        return seasons
+
+    def _last_used(self, year: str, event: str, info: Dict[str, Any]) -> float:
+        with self._lock:
+            return max(self._last_served.get((year, event), 0.0), info["lastModified"])
+
+    def _is_pinned(self, year: str, event: str, info: Dict[str, Any]) -> bool:
+        # Recent writes pin too: another server worker may be loading the event
+        with self._lock:
+            served = max(self._last_served.get((year, event), 0.0), info["lastModified"])
+        return time.time() - served < self.pin_seconds
+
+    def _remove(self, path: str, size: int):
+        shutil.rmtree(path, ignore_errors=True)
+        with self._lock:
+            self.evicted_bytes += size
+
+    def _forget(self, year: str, event: str):
+        with self._lock:
+            for key, dir_name in list(self._dir_names.items()):
+                if str(key[0]) == year and dir_name == event:
+                    del self._dir_names[key]
+
+    def enforce(self) -> List[str]:
+        """Evict stale seasons, then least recently used events until under budget"""
+        # One server worker evicts at a time; the others skip this round
+        lock = FileLock(os.path.join(self.root, ".locks", "evict.lock"))
+        if not lock.acquire(blocking=False):
+            return []
+        try:
+            return self._enforce()
+        finally:
+            lock.release()
+
+    def _enforce(self) -> List[str]:
+        evicted = []
+        seasons = self.scan()
+        now = time.time()
+
+        if self.max_age_days:
+            max_age = self.max_age_days * 86400
+            for year, events in list(seasons.items()):
+                if any(self._is_pinned(year, event, info) for event, info in events.items()):
+                    continue
+                last_used = max((self._last_used(year, e, i) for e, i in events.items()), default=0.0)
+                if now - last_used > max_age:
+                    self._remove(os.path.join(self.root, year), sum(i["bytes"] for i in events.values()))
+                    for event in events:
+                        self._forget(year, event)
+                    self.evicted_seasons += 1
+                    evicted.append(year)
+                    del seasons[year]
+
+        if self.max_bytes:
+            # Every server worker holds the HTTP cache open in SQLite, so deleting
+            # it would not free the space; it only shrinks the room left for events
+            http_bytes = self.http_cache_bytes()
+            if http_bytes > self.max_bytes:
+                logger.warning(f"FastF1 HTTP cache alone ({http_bytes} bytes) exceeds the cache budget")
+            total = http_bytes + sum(i["bytes"] for events in seasons.values() for i in events.values())
+            candidates = sorted(
+                (self._last_used(year, event, info), year, event, info["bytes"])
+                for year, events in seasons.items()
+                for event, info in events.items()
+                if not self._is_pinned(year, event, info)
+            )
+            for _, year, event, size in candidates:
+                if total <= self.max_bytes:
+                    break
+                self._remove(os.path.join(self.root, year, event), size)
+                self._forget(year, event)
+                self.evicted_events += 1
+                evicted.append(f"{year}/{event}")
+                total -= size
+
+            # Drop season directories left empty by event eviction
+            for year in seasons:
+                season_dir = os.path.join(self.root, year)
+                if os.path.isdir(season_dir) and not os.listdir(season_dir):
+                    os.rmdir(season_dir)
+
+        if evicted:
+            logger.info(f"Evicted from FastF1 cache: {evicted}")
+        return evicted
+
+    def info(self) -> Dict[str, Any]:
+        """Per-season and per-event breakdown with sizes, pins and load hit rates"""
+        seasons = self.scan()
+        breakdown = {}
+        total_bytes = 0
+        for year, events in sorted(seasons.items()):
+            season_bytes, season_hits, season_misses = 0, 0, 0
+            event_info = {}
+            for event, info in sorted(events.items()):
+                with self._lock:
+                    hits, misses = self._loads.get((year, event), (0, 0))
+                season_bytes += info["bytes"]
+                season_hits += hits
+                season_misses += misses
+                event_info[event] = {
+                    "bytes": info["bytes"],
+                    "files": info["files"],
+                    "pinned": self._is_pinned(year, event, info),
+                    "hits": hits,
+                    "misses": misses
+                }
+            total_bytes += season_bytes
+            loads = season_hits + season_misses
+            breakdown[year] = {
+                "bytes": season_bytes,
+                "sizeMB": round(season_bytes / (1024 * 1024), 2),
+                "hits": season_hits,
+                "misses": season_misses,
+                "hitRate": round(season_hits / loads, 4) if loads else 0.0,
+                "events": event_info
+            }
+
+        http_bytes = self.http_cache_bytes()
+        with self._lock:
+            hits = sum(c[0] for c in self._loads.values())
+            misses = sum(c[1] for c in self._loads.values())
+        return {
+            "budgetBytes": self.max_bytes,
+            "usedBytes": total_bytes + http_bytes,
+            "httpCacheBytes": http_bytes,
+            "hits": hits,
+            "misses": misses,
+            "hitRate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "evictedEvents": self.evicted_events,
+            "evictedSeasons": self.evicted_seasons,
+            "evictedBytes": self.evicted_bytes,
+            "seasons": breakdown
+        }
@@ -0,0 +1,133 @@
+"""
+Fast JSON serialization and negotiated gzip/brotli compression
+"""
+
+import gzip
+import json
+from typing import Any, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import orjson
+except ImportError:  # fall back to the standard library encoder
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Content types worth compressing; images like PNG are already compressed
+_COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/", "image/svg+xml")
+
+# Preferred order when the client accepts several encodings equally
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def dumps(payload: Any) -> bytes:
+    """Serialize a payload to compact JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the best supported encoding from an Accept-Encoding header"""
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        weight = 1.0
+        if params.strip().startswith("q="):
+            try:
+                weight = float(params.strip()[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    wildcard = weights.get("*", 0.0)
+    candidates = [(weights.get(enc, wildcard), enc) for enc in SUPPORTED_ENCODINGS]
+    candidates = [c for c in candidates if c[0] > 0]
+    if not candidates:
+        return None
+    # max() keeps the first of equal weights, i.e. the preferred encoding
+    return max(candidates, key=lambda c: c[0])[1]
+
+
+def is_compressible(media_type: str) -> bool:
+    """Whether a content type is worth compressing"""
+    return media_type.startswith(_COMPRESSIBLE_TYPES)
+
+
+def compress(body: bytes, encoding: str, best: bool = False) -> bytes:
+    """
+    Compress body with the given encoding
+    best=True spends more CPU for a smaller result, for bodies that are cached;
+    brotli 11 and gzip 9 cost 10-20x more for a few percent, so neither is used
+    """
+    if encoding == "br":
+        return brotli.compress(body, quality=6 if best else 4)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+class CompressionMiddleware:
+    """
+    Compress complete responses above a size threshold with gzip or brotli
+    Responses that already set Content-Encoding (pre-compressed cache entries),
+    streamed responses (NDJSON, SSE) and binary images are passed through untouched
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                headers = Headers(raw=message["headers"])
+                passthrough = "content-encoding" in headers or \
+                    not is_compressible(headers.get("content-type", ""))
+                return
+
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            if not passthrough:
+                body = message.get("body", b"")
+                if message.get("more_body", False) or len(body) < self.minimum_size:
+                    passthrough = True
+                else:
+                    body = compress(body, encoding)
+                    headers = MutableHeaders(raw=start_message["headers"])
+                    headers["Content-Encoding"] = encoding
+                    headers["Content-Length"] = str(len(body))
+                    if "accept-encoding" not in headers.get("vary", "").lower():
+                        headers.add_vary_header("Accept-Encoding")
+                    message = {**message, "body": body}
+
+            await send(start_message)
+            start_message = None
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
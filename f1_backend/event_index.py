@@ -0,0 +1,96 @@
+"""
+Per-season index of event names for resolving free-text event queries
+Built once from the formatted schedule so requests don't hit FastF1's fuzzy matching
+"""
+
+import difflib
+import re
+import threading
+import unicodedata
+from typing import Any, Dict, List, NamedTuple, Optional
+
+# Words that don't help tell events apart ("Las Vegas Grand Prix" == "Las Vegas GP")
+_STOPWORDS = {"grand", "prix", "gp", "formula", "the", "of", "de", "du"}
+
+# Fuzzy lookups are remembered, bounded so junk queries can't grow memory
+_MAX_MEMO = 1024
+
+
+class UnknownEventError(LookupError):
+    """Raised when a query doesn't match any event of the season"""
+
+
+class EventRef(NamedTuple):
+    """Canonical reference to one event of a season"""
+    year: int
+    round: int
+    name: str
+    date: Optional[str]
+
+    @property
+    def event_id(self) -> str:
+        return f"{self.year}-{self.round:02d}"
+
+
+def normalize(text: Any) -> str:
+    """Lowercase, strip accents and punctuation, and drop filler words"""
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode("ascii")
+    tokens = re.sub(r"[^a-z0-9]+", " ", text.lower()).split()
+    return " ".join(t for t in tokens if t not in _STOPWORDS and not re.fullmatch(r"(19|20)\d\d", t))
+
+
+class EventIndex:
+    """Alias -> round lookup for one season's events"""
+
+    def __init__(self, year: int, events: List[Dict[str, Any]]):
+        self.year = year
+        self.events: Dict[int, EventRef] = {}
+        self._aliases: Dict[str, int] = {}
+        self._memo: Dict[str, Optional[int]] = {}
+        self._lock = threading.Lock()
+
+        candidates: Dict[str, set] = {}
+        for event in events:
+            round_number = int(event.get("round") or 0)
+            if not round_number:
+                continue  # pre-season testing
+            self.events[round_number] = EventRef(year, round_number, event["name"], event.get("date"))
+
+            names = {normalize(event.get(field)) for field in ("name", "location", "country") if event.get(field)}
+            # Single distinctive words ("vegas", "azerbaijan") are aliases too, if unique
+            names |= {token for name in names for token in name.split() if len(token) >= 4}
+            for alias in names:
+                if alias:
+                    candidates.setdefault(alias, set()).add(round_number)
+
+        # Ambiguous aliases (e.g. a country hosting several events) are left out
+        self._aliases = {alias: next(iter(rounds)) for alias, rounds in candidates.items() if len(rounds) == 1}
+
+    def resolve(self, query: Any) -> EventRef:
+        """Resolve a round number, name, location, country or near-miss spelling"""
+        text = str(query).strip()
+        if text.isdigit():
+            round_number = int(text)
+        else:
+            key = normalize(text)
+            round_number = self._aliases.get(key)
+            if round_number is None and key:
+                round_number = self._fuzzy(key)
+
+        if round_number not in self.events:
+            raise UnknownEventError(f"Unknown event for {self.year}: {query}")
+        return self.events[round_number]
+
+    def _fuzzy(self, key: str) -> Optional[int]:
+        with self._lock:
+            if key in self._memo:
+                return self._memo[key]
+
+        match = difflib.get_close_matches(key, self._aliases.keys(), n=1, cutoff=0.75)
+        round_number = self._aliases[match[0]] if match else None
+
+        with self._lock:
+            if len(self._memo) >= _MAX_MEMO:
+                self._memo.clear()
+            self._memo[key] = round_number
+        return round_number
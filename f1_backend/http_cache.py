@@ -0,0 +1,95 @@
+"""
+HTTP conditional caching helpers: content-hash ETags, Cache-Control policies
+and pre-encoded cache entries
+"""
+
+import asyncio
+import hashlib
+from typing import Any, Dict, Optional
+
+from encoding import compress, dumps, is_compressible
+
+# Finished seasons and settled events never change, so browsers and CDNs may keep them for a year
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def compute_etag(body: bytes) -> str:
+    """Strong ETag derived from the encoded response body"""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches etag (weak comparison, per RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def cache_control(finished: bool, max_age: int) -> str:
+    """Cache-Control for data that is final (finished season or settled event) or may still change"""
+    if finished:
+        return IMMUTABLE_CACHE_CONTROL
+    return f"public, max-age={max_age}"
+
+
+def cache_headers(etag: str, finished: bool, max_age: int) -> Dict[str, str]:
+    """ETag, Cache-Control and Vary, identical on a 200 and on the 304 that revalidates it"""
+    return {
+        "ETag": etag,
+        "Cache-Control": cache_control(finished, max_age),
+        "Vary": "Accept-Encoding"
+    }
+
+
+class CachedBody:
+    """
+    An encoded response body kept together with its media type and ETag;
+    compressed variants are added on demand and reused
+    """
+
+    __slots__ = ("body", "media_type", "etag", "_compressed")
+
+    def __init__(self, body: bytes, media_type: str):
+        self.body = body
+        self.media_type = media_type
+        self.etag = compute_etag(body)
+        self._compressed: Dict[str, bytes] = {}
+
+    @property
+    def compressible(self) -> bool:
+        return is_compressible(self.media_type)
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        """ETag of the body in the given content encoding; each variant is a different representation"""
+        if encoding is None:
+            return self.etag
+        return f'{self.etag[:-1]}-{encoding}"'
+
+    async def encoded(self, encoding: Optional[str]) -> bytes:
+        """
+        Body in the given content encoding, compressed once and then reused
+        Compression runs off the event loop; large payloads take tens of ms
+        """
+        if encoding is None:
+            return self.body
+        body = self._compressed.get(encoding)
+        if body is None:
+            body = await asyncio.to_thread(compress, self.body, encoding, True)
+            self._compressed[encoding] = body
+        return body
+
+
+class CachedPayload(CachedBody):
+    """
+    A JSON response payload kept together with its encoded body and ETag,
+    so repeat hits skip serialization
+    """
+
+    __slots__ = ("payload",)
+
+    def __init__(self, payload: Any):
+        super().__init__(dumps(payload), "application/json")
+        self.payload = payload
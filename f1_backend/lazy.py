@@ -0,0 +1,44 @@
+"""
+Deferred imports for heavy dependencies (FastF1, pandas, pyarrow, matplotlib)
+so the API can answer /health before any of them are loaded
+"""
+
+import importlib
+import importlib.util
+import sys
+import threading
+from types import ModuleType
+
+# Serialises first loads; importlib.util.LazyLoader lets a second thread see
+# a half-executed module while the first one is still running it
+_load_lock = threading.RLock()
+
+
+class _LazyModule(ModuleType):
+    """Stand-in that imports the real module on first attribute access"""
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__.get("_lazy_module")
+        if module is None:
+            with _load_lock:
+                module = self.__dict__.get("_lazy_module")
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Module that is only executed on first attribute access; safe to first touch from several threads"""
+    if name in sys.modules:
+        return sys.modules[name]
+
+    if importlib.util.find_spec(name) is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    return _LazyModule(name)
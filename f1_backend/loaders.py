@@ -0,0 +1,232 @@
+"""
+Blocking FastF1 jobs executed in the worker pool
+Functions here must stay at module level so they can be sent to a process pool
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from file_lock import FileLock
+from lazy import lazy_import
+from qualifying import (SECTOR_COLUMNS, SPEED_TRAP_COLUMNS, fastest_laps_table, format_results, format_sectors,
+                        sector_table, team_color_map)
+from result_store import ResultStore
+from telemetry import downsample_traces
+
+pd = lazy_import("pandas")
+
+# F1_REPLAY_BUNDLE serves sessions and schedules from a recorded snapshot
+# (see replay.py) instead of the live FastF1 API, for offline runs
+REPLAY_BUNDLE = os.getenv("F1_REPLAY_BUNDLE")
+if REPLAY_BUNDLE:
+    from replay import ReplayBundle
+    fastf1 = ReplayBundle(REPLAY_BUNDLE)
+else:
+    fastf1 = lazy_import("fastf1")
+
+logger = logging.getLogger(__name__)
+
+# Lock files shared by every server worker, set by init_worker
+_lock_dir: Optional[str] = None
+
+
+class NoSessionDataError(Exception):
+    """Raised when a session loads but has no usable lap data"""
+
+
+class QualifyingLoad(NamedTuple):
+    """Result of load_qualifying, with the store counters of this job for the parent to merge"""
+    payload: Dict[str, Any]
+    sectors: Dict[str, Any]
+    from_store: bool
+    store_counts: Dict[str, int]
+
+
+def init_worker(cache_dir: str):
+    """Pool initializer so spawned workers share the FastF1 disk cache"""
+    global _lock_dir
+    fastf1.Cache.enable_cache(cache_dir)
+    _lock_dir = os.path.join(cache_dir, ".locks")
+
+
+def session_lock(year: int, round_number: int, session: str):
+    """
+    Cross-process lock for loading one session, so only one server worker
+    downloads and pickles it into the shared FastF1 cache
+    """
+    if _lock_dir is None:
+        return contextlib.nullcontext()
+    return FileLock(os.path.join(_lock_dir, f"{year}_{round_number:02d}_{session}.lock"))
+
+
+def load_cache_info(cache_dir: str):
+    """(path, size in bytes) of the FastF1 cache; imports FastF1 on first use"""
+    init_worker(cache_dir)
+    return fastf1.Cache.get_cache_info()
+
+
+def build_payload(fastest_laps: pd.DataFrame, event_title: str) -> Dict[str, Any]:
+    """Build the /api/f1/qualifying payload from a fastest-lap table with TeamColor"""
+    team_colors = dict(zip(fastest_laps['Team'], fastest_laps['TeamColor']))
+    results = format_results(fastest_laps, team_colors)
+
+    return {
+        "event": event_title,
+        "session": "Qualifying",
+        "results": results[:20],  # Top 20 drivers
+        "polePosition": {
+            "driver": results[0]["driver"] if results else None,
+            "time": results[0]["lapTime"] if results else None
+        },
+        "totalDrivers": len(results)
+    }
+
+
+def build_sectors_payload(sectors: pd.DataFrame, fastest_laps: pd.DataFrame, event_title: str) -> Dict[str, Any]:
+    """Build the /api/f1/qualifying/sectors payload from a sector table and the fastest-lap table"""
+    team_colors = dict(zip(fastest_laps['Team'], fastest_laps['TeamColor']))
+
+    # Session-wide bests: who set each best sector and each top speed
+    overall: Dict[str, Any] = {}
+    best_total = pd.Timedelta(0)
+    for number, column in enumerate(SECTOR_COLUMNS, start=1):
+        if column in sectors.columns and sectors[column].notna().any():
+            best = sectors.loc[sectors[column].idxmin()]
+            best_total += best[column]
+            overall[f"sector{number}"] = {"driver": best['Driver'], "time": round(best[column].total_seconds(), 3)}
+    overall["theoreticalBest"] = round(best_total.total_seconds(), 3) if len(overall) == len(SECTOR_COLUMNS) else None
+    for column in SPEED_TRAP_COLUMNS:
+        if column in sectors.columns and sectors[column].notna().any():
+            best = sectors.loc[sectors[column].idxmax()]
+            overall[f"speed{column[len('Speed'):]}"] = {"driver": best['Driver'], "speed": round(float(best[column]), 1)}
+
+    return {
+        "event": event_title,
+        "session": "Qualifying",
+        "drivers": format_sectors(sectors, fastest_laps, team_colors),
+        "overall": overall
+    }
+
+
+def load_stored_qualifying(store: ResultStore, year: int, round_number: int,
+                           max_age: Optional[float] = None) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    Rebuild both payloads from the derived-results store without loading the session
+    Tables older than max_age seconds are ignored (None: any age)
+    """
+    stored = store.load_table(year, f"{round_number:02d}", 'Q', max_age=max_age)
+    stored_sectors = store.load_table(year, f"{round_number:02d}", 'Q_sectors', max_age=max_age) if stored else None
+    if stored_sectors is None:
+        return None
+    (fastest_laps, metadata), (sectors, _) = stored, stored_sectors
+    event_title = metadata.get("event", f"Round {round_number} {year}")
+    return build_payload(fastest_laps, event_title), build_sectors_payload(sectors, fastest_laps, event_title)
+
+
+def load_qualifying(year: int, round_number: int, store_root: Optional[str] = None,
+                    max_age: Optional[float] = None) -> QualifyingLoad:
+    """
+    Load a qualifying session and build the /api/f1/qualifying and
+    /api/f1/qualifying/sectors payloads from the same laps
+    The store is opened here from its root, since a ResultStore can't be sent to a process pool
+    """
+    store = ResultStore(store_root) if store_root is not None else None
+    with session_lock(year, round_number, 'Q'):
+        # Another server worker may have just loaded it; reuse its results
+        stored = load_stored_qualifying(store, year, round_number, max_age) if store is not None else None
+        from_store = stored is not None
+        if stored is None:
+            stored = _load_qualifying(year, round_number, store)
+    counts = store.counts() if store is not None else {}
+    return QualifyingLoad(stored[0], stored[1], from_store, counts)
+
+
+def _load_qualifying(year: int, round_number: int,
+                     store: Optional[ResultStore]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    # Passing the round number skips FastF1's fuzzy event-name matching
+    session = fastf1.get_session(year, round_number, 'Q')
+    session.load()
+
+    # Fastest lap per driver, sorted, with deltas to pole (one sorted pass)
+    fastest_laps = fastest_laps_table(session.laps)
+    logger.info(f"Found {len(fastest_laps)} drivers: {list(fastest_laps['Driver'])}")
+
+    if fastest_laps.empty:
+        raise NoSessionDataError("No qualifying data found")
+
+    # Best sectors and speed traps: the one extra groupby pass over the laps
+    sectors = sector_table(session.laps)
+
+    team_colors = team_color_map(fastest_laps['Team'], session=session)
+    fastest_laps['TeamColor'] = fastest_laps['Team'].map(team_colors)
+
+    # Get event information
+    event_name = session.event['EventName'] if hasattr(session.event, 'EventName') else f"Round {round_number}"
+    event_year = session.event.year if hasattr(session.event, 'year') else year
+    event_title = f"{event_name} {event_year}"
+
+    if store is not None:
+        try:
+            store.save_table(year, f"{round_number:02d}", 'Q', fastest_laps, {"event": event_title})
+            store.save_table(year, f"{round_number:02d}", 'Q_sectors', sectors, {"event": event_title})
+        except Exception as e:
+            logger.warning(f"Could not persist derived results for {event_title}: {e}")
+
+    return build_payload(fastest_laps, event_title), build_sectors_payload(sectors, fastest_laps, event_title)
+
+
+def load_telemetry(year: int, round_number: int, drivers: List[str], points: int) -> Dict[str, Any]:
+    """Load the drivers' fastest qualifying laps and build the /api/f1/telemetry payload"""
+    session = fastf1.get_session(year, round_number, 'Q')
+    with session_lock(year, round_number, 'Q'):
+        session.load(laps=True, telemetry=True, weather=False, messages=False)
+
+    laps, traces = [], []
+    for driver in drivers:
+        lap = session.laps.pick_drivers(driver).pick_fastest()
+        if lap is None or lap.empty or pd.isna(lap.get('LapTime')):
+            raise NoSessionDataError(f"No timed qualifying lap for {driver}")
+        laps.append(lap)
+        traces.append(lap.get_car_data().add_distance())
+
+    distance, series = downsample_traces(traces, points)
+    team_colors = team_color_map((lap['Team'] for lap in laps), session=session)
+
+    event_name = session.event['EventName'] if hasattr(session.event, 'EventName') else f"Round {round_number}"
+    return {
+        "event": f"{event_name} {year}",
+        "session": "Qualifying",
+        "points": len(distance),
+        "distance": distance,
+        "drivers": [
+            {
+                "driver": lap['Driver'],
+                "team": lap['Team'],
+                "teamColor": team_colors[lap['Team']],
+                "lapTime": str(lap['LapTime']).split()[-1],
+                **trace
+            }
+            for lap, trace in zip(laps, series)
+        ]
+    }
+
+
+def load_events(year: int) -> List[Dict[str, Any]]:
+    """Fetch the event schedule for a season and format it for the frontend"""
+    schedule = fastf1.get_event_schedule(year)
+    events = []
+
+    for idx, event in schedule.iterrows():
+        events.append({
+            "round": event.get('RoundNumber', idx + 1),
+            "name": event['EventName'],
+            "location": event.get('Location', 'Unknown'),
+            "country": event.get('Country', 'Unknown'),
+            "date": event['Session5Date'].strftime('%Y-%m-%d') if pd.notna(event.get('Session5Date')) else None
+        })
+
+    return events
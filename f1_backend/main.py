@@ -1,28 +1,352 @@
-from fastapi import FastAPI, HTTPException
+import time
+
+# Cold-start measurement; heavy modules (FastF1, pandas, pyarrow, matplotlib)
+# are imported lazily so /health answers before they are loaded
+STARTED_AT = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-import fastf1
-import fastf1.plotting
-import pandas as pd
-from fastf1.core import Laps
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel
+import asyncio
 from datetime import datetime, timedelta
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import tempfile
 import logging
 
+from charts import CHART_FORMATS, init_renderer, render_qualifying_chart
+from disk_cache import DiskCacheManager
+from encoding import CompressionMiddleware, dumps, negotiate_encoding
+from event_index import EventIndex, EventRef, UnknownEventError
+from file_lock import FileLock
+from http_cache import CachedBody, CachedPayload, cache_headers, etag_matches
+from loaders import NoSessionDataError, init_worker, load_cache_info, load_events, load_qualifying, load_telemetry
+from prewarm import SeasonPrewarmer, completed_events
+from result_cache import ResultCache
+from result_store import ResultStore
+from revalidate import Revalidator
+from single_flight import SingleFlight
+from worker_pool import WorkerPool, WorkerPoolFullError
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Enable FastF1 cache
+# FastF1 cache; enabled by init_worker in the pool workers that load sessions
 cache_dir = os.path.join(os.getcwd(), "cache")
 os.makedirs(cache_dir, exist_ok=True)
-fastf1.Cache.enable_cache(cache_dir)
 
-# Enable Matplotlib patches for plotting timedelta values
-fastf1.plotting.setup_mpl(mpl_timedelta_support=True, color_scheme=None)
+# Keep the FastF1 cache under a byte budget (0 = unlimited); recently served events are pinned
+CACHE_MAX_BYTES = int(os.getenv("F1_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+CACHE_PIN_SECONDS = float(os.getenv("F1_CACHE_PIN_SECONDS", "3600"))
+CACHE_MAX_AGE_DAYS = float(os.getenv("F1_CACHE_MAX_AGE_DAYS", "0"))
+disk_cache = DiskCacheManager(
+    cache_dir,
+    max_bytes=CACHE_MAX_BYTES,
+    pin_seconds=CACHE_PIN_SECONDS,
+    max_age_days=CACHE_MAX_AGE_DAYS
+)
+
+# In-memory cache of computed qualifying payloads (settled events never expire)
+RESULT_CACHE_SIZE = int(os.getenv("F1_RESULT_CACHE_SIZE", "256"))
+RESULT_CACHE_TTL = float(os.getenv("F1_RESULT_CACHE_TTL", "300"))
+qualifying_cache = ResultCache(max_entries=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL)
+sectors_cache = ResultCache(max_entries=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL)
+events_cache = ResultCache(max_entries=64, ttl=RESULT_CACHE_TTL)
+
+# Stale-while-revalidate for seasons in progress: qualifying and schedule entries
+# older than the season's freshness window (default RESULT_CACHE_TTL, per-season
+# overrides as "2025=60,2024=3600") are served immediately while one background
+# refresh per entry reloads them; entries older than STALE_MAX_AGE are reloaded inline
+SEASON_FRESHNESS = {
+    int(year): float(seconds)
+    for year, seconds in (
+        item.split("=", 1) for item in os.getenv("F1_SEASON_FRESHNESS", "").split(",") if item.strip()
+    )
+}
+STALE_MAX_AGE = float(os.getenv("F1_STALE_MAX_AGE", "86400"))
+REFRESH_MIN_INTERVAL = float(os.getenv("F1_REFRESH_MIN_INTERVAL", "60"))
+REFRESH_CONCURRENCY = int(os.getenv("F1_REFRESH_CONCURRENCY", "1"))
+revalidator = Revalidator(min_interval=REFRESH_MIN_INTERVAL, concurrency=REFRESH_CONCURRENCY)
+
+# Downsampled telemetry comparisons, keyed by event, drivers and point budget
+TELEMETRY_CACHE_SIZE = int(os.getenv("F1_TELEMETRY_CACHE_SIZE", "64"))
+TELEMETRY_MAX_DRIVERS = int(os.getenv("F1_TELEMETRY_MAX_DRIVERS", "5"))
+TELEMETRY_MAX_POINTS = int(os.getenv("F1_TELEMETRY_MAX_POINTS", "2000"))
+telemetry_cache = ResultCache(max_entries=TELEMETRY_CACHE_SIZE, ttl=RESULT_CACHE_TTL)
+
+# Responses at least this large are compressed (gzip, or brotli if installed)
+COMPRESS_MIN_SIZE = int(os.getenv("F1_COMPRESS_MIN_SIZE", "1024"))
+
+# Browser/CDN max-age for data that can still change (current season)
+HTTP_MAX_AGE = int(os.getenv("F1_HTTP_MAX_AGE", "60"))
+# Event data is final this many days after the race; stewards' decisions and
+# late timing corrections land within that window
+EVENT_SETTLE_DAYS = float(os.getenv("F1_EVENT_SETTLE_DAYS", "7"))
+
+# On-disk columnar store of derived results, so restarts and other server
+# workers skip session loads
+RESULT_STORE_DIR = os.getenv("F1_RESULT_STORE_DIR", os.path.join(os.getcwd(), "derived"))
+result_store = ResultStore(RESULT_STORE_DIR)
+
+# Worker pool for blocking session loads and schedule fetches
+WORKER_MODE = os.getenv("F1_WORKER_MODE", "thread")  # "thread" or "process"
+WORKER_COUNT = int(os.getenv("F1_WORKER_COUNT", "0")) or None  # defaults to CPU count
+WORKER_QUEUE_DEPTH = int(os.getenv("F1_WORKER_QUEUE_DEPTH", "32"))
+worker_pool = WorkerPool(
+    mode=WORKER_MODE,
+    max_workers=WORKER_COUNT,
+    max_queue=WORKER_QUEUE_DEPTH,
+    initializer=init_worker,
+    initargs=(cache_dir,)
+)
+
+# Chart rendering runs in its own process pool: matplotlib is CPU-heavy and not thread-safe
+CHART_WORKERS = int(os.getenv("F1_CHART_WORKERS", "2"))
+CHART_QUEUE_DEPTH = int(os.getenv("F1_CHART_QUEUE_DEPTH", "16"))
+CHART_CACHE_SIZE = int(os.getenv("F1_CHART_CACHE_SIZE", "128"))
+CHART_MIN_SIZE, CHART_MAX_SIZE = 200, 2000
+chart_pool = WorkerPool(
+    mode="process",
+    max_workers=CHART_WORKERS,
+    max_queue=CHART_QUEUE_DEPTH,
+    initializer=init_renderer
+)
+chart_cache = ResultCache(max_entries=CHART_CACHE_SIZE, ttl=RESULT_CACHE_TTL)
+
+# Concurrent requests for the same session share one in-flight load
+session_loads = SingleFlight()
+
+# Per-season event name indexes, keyed by year with the schedule they were built from
+event_indexes: Dict[int, Tuple[CachedPayload, EventIndex]] = {}
+
+def is_finished_season(year: int) -> bool:
+    """Seasons before the current calendar year no longer change"""
+    return year < datetime.now().year
+
+def is_settled_event(ref: EventRef) -> bool:
+    """Whether an event's data can no longer change, so responses may be cached as immutable"""
+    if is_finished_season(ref.year):
+        return True
+    if not ref.date:
+        return False
+    return datetime.strptime(ref.date, "%Y-%m-%d") + timedelta(days=EVENT_SETTLE_DAYS) <= datetime.now()
+
+def season_freshness(year: int) -> Optional[float]:
+    """Seconds a season's cached schedule counts as fresh, or None if it never goes stale"""
+    if year in SEASON_FRESHNESS:
+        return SEASON_FRESHNESS[year]
+    return None if is_finished_season(year) else RESULT_CACHE_TTL
+
+def freshness_window(ref: EventRef) -> Optional[float]:
+    """Seconds an event's cached payloads count as fresh, or None once the event has settled"""
+    if is_settled_event(ref):
+        return None
+    return season_freshness(ref.year)
+
+def stale_ttl(freshness: Optional[float]) -> Optional[float]:
+    """In-memory lifetime of entries with this freshness window, including the time they may be served stale"""
+    return None if freshness is None else max(freshness, STALE_MAX_AGE)
+
+async def resolve_event(year: int, event: str) -> EventRef:
+    """Resolve a free-text event against the season's index, rebuilt when the schedule changes"""
+    schedule = await fetch_schedule(year)
+    indexed = event_indexes.get(year)
+    if indexed is None or indexed[0] is not schedule:
+        indexed = (schedule, EventIndex(year, schedule.payload["events"]))
+        event_indexes[year] = indexed
+    return indexed[1].resolve(event)
+
+async def fetch_session(year: int, event: str) -> Tuple[CachedPayload, CachedPayload]:
+    """
+    Return the qualifying and sector payloads from cache, or load the session
+    once for all waiters; both are built from the same pass over the laps.
+    Stale entries are served while a background refresh reloads them
+    """
+    # "Las Vegas", "las vegas gp" and "22" all share the same canonical key
+    ref = await resolve_event(year, event)
+    disk_cache.touch(year, ref.name, ref.date)
+    cache_key = (year, ref.round)
+    freshness = freshness_window(ref)
+
+    async def load() -> Tuple[CachedPayload, CachedPayload]:
+        # The store is shared by all server workers; settled events no longer
+        # change, other tables are reused within the freshness window
+        max_age = freshness
+        logger.info(f"Fetching qualifying results for {ref.event_id} {ref.name}")
+        on_disk = disk_cache.is_cached(year, ref.name, ref.date)
+        
+        # Reading the result store and loading the session both run in the worker
+        # pool, which checks the store first under the session lock. The job gets
+        # the store root; a ResultStore holds a lock and can't be pickled
+        loaded = await worker_pool.run(load_qualifying, year, ref.round, result_store.root, max_age)
+        result_store.merge_counts(loaded.store_counts)
+        if loaded.from_store:
+            logger.info(f"Loaded qualifying results for {ref.event_id} {ref.name} from the result store")
+        else:
+            disk_cache.record_load(year, ref.name, ref.date, hit=on_disk)
+            asyncio.ensure_future(enforce_disk_budget())
+        
+        response_data, sectors_data = loaded.payload, loaded.sectors
+        response_data["cacheInfo"] = {
+            "cacheDir": cache_dir,
+            "cacheEnabled": True
+        }
+        
+        ttl = stale_ttl(freshness)
+        entries = (CachedPayload(response_data), CachedPayload(sectors_data))
+        qualifying_cache.set(cache_key, entries[0], ttl=ttl)
+        sectors_cache.set(cache_key, entries[1], ttl=ttl)
+        logger.info(f"Successfully fetched qualifying results for {response_data['totalDrivers']} drivers")
+        return entries
 
-app = FastAPI(title="F1 Qualifying Results API", version="1.0.0")
+    cached, cached_sectors = qualifying_cache.get_with_age(cache_key), sectors_cache.get_with_age(cache_key)
+    if cached is not None and cached_sectors is not None:
+        logger.info(f"Serving cached qualifying results for {ref.event_id} {ref.name}")
+        age = max(cached[1], cached_sectors[1])
+        revalidator.maybe_refresh(
+            cache_key + ("Q",), age, freshness,
+            lambda: session_loads.do(cache_key + ("Q",), load)
+        )
+        return cached[0], cached_sectors[0]
+
+    return await session_loads.do(cache_key + ("Q",), load)
+
+async def fetch_qualifying(year: int, event: str) -> CachedPayload:
+    """Return the /api/f1/qualifying payload"""
+    return (await fetch_session(year, event))[0]
+
+async def fetch_sectors(year: int, event: str) -> CachedPayload:
+    """Return the /api/f1/qualifying/sectors payload"""
+    return (await fetch_session(year, event))[1]
+
+async def enforce_disk_budget():
+    """Evict from the FastF1 cache off the event loop, one run at a time"""
+    try:
+        await session_loads.do(("disk-cache-evict",), lambda: asyncio.to_thread(disk_cache.enforce))
+    except Exception as e:
+        logger.error(f"Error enforcing FastF1 cache budget: {e}")
+
+async def fetch_schedule(year: int) -> CachedPayload:
+    """
+    Return the /api/f1/events payload from cache, or fetch it once for all waiters;
+    stale entries are served while a background refresh reloads them
+    """
+    async def load() -> CachedPayload:
+        events = await worker_pool.run(load_events, year)
+        entry = CachedPayload({"year": year, "events": events})
+        events_cache.set(year, entry, ttl=stale_ttl(season_freshness(year)))
+        return entry
+
+    cached = events_cache.get_with_age(year)
+    if cached is not None:
+        revalidator.maybe_refresh(
+            ("schedule", year), cached[1], season_freshness(year),
+            lambda: session_loads.do(("schedule", year), load)
+        )
+        return cached[0]
+
+    return await session_loads.do(("schedule", year), load)
+
+async def fetch_events(year: int) -> List[Dict[str, Any]]:
+    """Formatted event list for a season"""
+    return (await fetch_schedule(year)).payload["events"]
+
+async def conditional_response(request: Request, entry: CachedBody, finished: bool) -> Response:
+    """200 with the cached body, or 304 if the client already has this ETag"""
+    encoding = None
+    if entry.compressible and len(entry.body) >= COMPRESS_MIN_SIZE:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    # Each content encoding is its own representation with its own ETag
+    etag = entry.etag_for(encoding)
+    headers = cache_headers(etag, finished, HTTP_MAX_AGE)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    # Serve the pre-encoded (and pre-compressed) body; the compression
+    # middleware leaves responses with Content-Encoding alone
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(content=await entry.encoded(encoding), media_type=entry.media_type, headers=headers)
+
+async def fetch_telemetry(year: int, event: str, drivers: List[str], points: int) -> CachedPayload:
+    """Return a telemetry comparison from cache, or load it once for all waiters"""
+    ref = await resolve_event(year, event)
+    disk_cache.touch(year, ref.name, ref.date)
+    cache_key = (year, ref.round, tuple(drivers), points)
+    cached = telemetry_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    async def load() -> CachedPayload:
+        logger.info(f"Fetching telemetry for {ref.event_id} {ref.name}: {', '.join(drivers)}")
+        disk_cache.record_load(year, ref.name, ref.date)
+        payload = await worker_pool.run(load_telemetry, year, ref.round, drivers, points)
+        asyncio.ensure_future(enforce_disk_budget())
+        entry = CachedPayload(payload)
+        telemetry_cache.set(cache_key, entry, ttl=freshness_window(ref))
+        return entry
+
+    return await session_loads.do(("telemetry",) + cache_key, load)
+
+async def fetch_chart(year: int, event: str, fmt: str, width: int, height: int) -> CachedBody:
+    """Return a rendered qualifying chart, rendering it once for all waiters"""
+    ref = await resolve_event(year, event)
+    entry = await fetch_qualifying(year, event)
+    # Keyed on the payload's ETag, so a changed result is never served a stale image
+    cache_key = (year, entry.etag, fmt, width, height)
+    cached = chart_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    async def render() -> CachedBody:
+        image = await chart_pool.run(render_qualifying_chart, entry.payload, fmt, width, height)
+        # SVGs are compressed once per encoding and reused, like JSON payloads
+        rendered = CachedBody(image, CHART_FORMATS[fmt])
+        chart_cache.set(cache_key, rendered, ttl=freshness_window(ref))
+        logger.info(f"Rendered {fmt} qualifying chart for {year} {event} ({len(image)} bytes)")
+        return rendered
+
+    return await session_loads.do(("chart",) + cache_key, render)
+
+# Background prewarm of completed events, e.g. F1_PREWARM_SEASONS=2024,2025
+# With several server workers only the one holding prewarm_lock prewarms
+PREWARM_SEASONS = [int(y) for y in os.getenv("F1_PREWARM_SEASONS", "").split(",") if y.strip()]
+PREWARM_CONCURRENCY = int(os.getenv("F1_PREWARM_CONCURRENCY", "2"))
+PREWARM_INTERVAL = float(os.getenv("F1_PREWARM_INTERVAL", "3600"))
+prewarmer = SeasonPrewarmer(
+    seasons=PREWARM_SEASONS,
+    fetch_events=fetch_events,
+    fetch_qualifying=fetch_qualifying,
+    concurrency=PREWARM_CONCURRENCY,
+    interval=PREWARM_INTERVAL
+)
+prewarm_lock = FileLock(os.path.join(cache_dir, ".locks", "prewarm.lock"))
+
+# Batch qualifying requests
+BATCH_MAX_EVENTS = int(os.getenv("F1_BATCH_MAX_EVENTS", "50"))
+BATCH_CONCURRENCY = int(os.getenv("F1_BATCH_CONCURRENCY", str(worker_pool.max_workers)))
+
+class BatchEvent(BaseModel):
+    year: int
+    event: str
+
+class BatchQualifyingRequest(BaseModel):
+    events: List[BatchEvent] = []
+    season: Optional[int] = None
+
+def error_status(e: Exception) -> int:
+    """HTTP status for an error raised while fetching F1 data"""
+    if isinstance(e, WorkerPoolFullError):
+        return 503
+    if isinstance(e, (NoSessionDataError, UnknownEventError)):
+        return 404
+    return 500
+
+app = FastAPI(title="F1 Qualifying Results API", version="1.0.0", default_response_class=ORJSONResponse)
+
+app.add_middleware(CompressionMiddleware, minimum_size=COMPRESS_MIN_SIZE)
 
 # Enable CORS for your React app
 app.add_middleware(
@@ -39,6 +363,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+ready_seconds: Optional[float] = None
+
+@app.on_event("startup")
+async def start_prewarm():
+    global ready_seconds
+    # Eviction scans the whole cache directory; don't hold up readiness for it
+    asyncio.ensure_future(enforce_disk_budget())
+    ready_seconds = time.perf_counter() - STARTED_AT
+    logger.info(f"F1 API ready {ready_seconds * 1000:.0f} ms after import")
+    if prewarmer.seasons and not prewarm_lock.acquire(blocking=False):
+        logger.info("Another server worker is prewarming; results are shared through the result store")
+        return
+    prewarmer.start()
+
+@app.on_event("shutdown")
+async def shutdown_worker_pool():
+    await prewarmer.stop()
+    await revalidator.stop()
+    prewarm_lock.release()
+    worker_pool.shutdown()
+    chart_pool.shutdown()
+
 @app.get("/")
 async def root():
     return {
@@ -50,134 +396,189 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "startupSeconds": round(ready_seconds, 3) if ready_seconds is not None else None,
+        "workerPool": worker_pool.stats(),
+        "chartPool": chart_pool.stats(),
+        "sessionLoads": session_loads.stats(),
+        "revalidation": revalidator.stats()
+    }
 
 @app.get("/api/f1/qualifying")
-async def get_qualifying_results(year: int = 2024, event: str = "Las Vegas"):
+async def get_qualifying_results(request: Request, year: int = 2024, event: str = "Las Vegas"):
     """
     Get qualifying results for a specific F1 event
     Based on the plot_qualifying_results.py example
     """
     try:
-        logger.info(f"Fetching qualifying results for {year} {event}")
-        
-        # Get the qualifying session (same as the example)
-        session = fastf1.get_session(year, event, 'Q')
-        session.load()
-        
-        # Get all drivers (same as the example)
-        drivers = pd.unique(session.laps['Driver'])
-        logger.info(f"Found {len(drivers)} drivers: {list(drivers)}")
-        
-        # Get fastest lap for each driver (same as the example)
-        list_fastest_laps = []
-        for drv in drivers:
-            try:
-                drvs_fastest_lap = session.laps.pick_drivers(drv).pick_fastest()
-                if not drvs_fastest_lap.empty:
-                    list_fastest_laps.append(drvs_fastest_lap)
-            except Exception as e:
-                logger.warning(f"Could not get fastest lap for {drv}: {e}")
-                continue
-        
-        if not list_fastest_laps:
-            raise HTTPException(status_code=404, detail="No qualifying data found")
-        
-        # Create Laps object and sort by lap time (same as the example)
-        fastest_laps = Laps(list_fastest_laps) \
-            .sort_values(by='LapTime') \
-            .reset_index(drop=True)
-        
-        # Calculate time differences from pole position (same as the example)
-        pole_lap = fastest_laps.pick_fastest()
-        fastest_laps['LapTimeDelta'] = fastest_laps['LapTime'] - pole_lap['LapTime']
-        
-        # Get team colors (same as the example)
-        team_colors = []
-        for index, lap in fastest_laps.iterlaps():
-            try:
-                color = fastf1.plotting.get_team_color(lap['Team'], session=session)
-                team_colors.append(color)
-            except:
-                team_colors.append("#FFFFFF")  # Default white color
-        
-        # Format data for frontend
-        results = []
-        for idx, lap in fastest_laps.iterrows():
-            time_delta = lap['LapTimeDelta']
-            
-            # Format lap time
-            lap_time_str = str(lap['LapTime']).split()[-1] if pd.notna(lap['LapTime']) else "N/A"
-            
-            # Format time delta
-            if time_delta.total_seconds() > 0:
-                time_delta_str = f"+{time_delta.total_seconds():.3f}s"
-            else:
-                time_delta_str = "Pole"
-            
-            result = {
-                "position": idx + 1,
-                "driver": lap['Driver'],
-                "team": lap['Team'],
-                "lapTime": lap_time_str,
-                "timeDelta": time_delta_str,
-                "teamColor": team_colors[idx] if idx < len(team_colors) else "#FFFFFF"
-            }
-            results.append(result)
-        
-        # Get event information
-        event_name = session.event['EventName'] if hasattr(session.event, 'EventName') else event
-        event_year = session.event.year if hasattr(session.event, 'year') else year
-        
-        response_data = {
-            "event": f"{event_name} {event_year}",
-            "session": "Qualifying",
-            "results": results[:20],  # Top 20 drivers
-            "polePosition": {
-                "driver": results[0]["driver"] if results else None,
-                "time": results[0]["lapTime"] if results else None
-            },
-            "totalDrivers": len(results),
-            "cacheInfo": {
-                "cacheDir": cache_dir,
-                "cacheEnabled": True
-            }
-        }
-        
-        logger.info(f"Successfully fetched qualifying results for {len(results)} drivers")
-        return response_data
+        ref = await resolve_event(year, event)
+        entry = await fetch_qualifying(year, event)
+        return await conditional_response(request, entry, is_settled_event(ref))
         
+    except WorkerPoolFullError as e:
+        logger.warning(f"Rejecting qualifying request for {year} {event}: {e}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except (NoSessionDataError, UnknownEventError) as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching qualifying data: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching qualifying data: {str(e)}")
 
+@app.get("/api/f1/qualifying/sectors")
+async def get_qualifying_sectors(request: Request, year: int = 2024, event: str = "Las Vegas"):
+    """
+    Get per-driver best sectors, theoretical best lap, sector deltas and
+    speed-trap maxima over all laps of the qualifying session
+    """
+    try:
+        ref = await resolve_event(year, event)
+        entry = await fetch_sectors(year, event)
+        return await conditional_response(request, entry, is_settled_event(ref))
+        
+    except WorkerPoolFullError as e:
+        logger.warning(f"Rejecting sectors request for {year} {event}: {e}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except (NoSessionDataError, UnknownEventError) as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error fetching sector analytics: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error fetching sector analytics: {str(e)}")
+
+@app.get("/api/f1/qualifying/chart")
+async def get_qualifying_chart(request: Request, year: int = 2024, event: str = "Las Vegas",
+                               format: str = "png", width: int = 800, height: int = 600):
+    """
+    Get the qualifying delta chart from plot_qualifying_results.py as a PNG or SVG image
+    """
+    if format not in CHART_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format} (use {', '.join(CHART_FORMATS)})")
+    if not (CHART_MIN_SIZE <= width <= CHART_MAX_SIZE and CHART_MIN_SIZE <= height <= CHART_MAX_SIZE):
+        raise HTTPException(status_code=400, detail=f"Width and height must be between {CHART_MIN_SIZE} and {CHART_MAX_SIZE}")
+
+    try:
+        ref = await resolve_event(year, event)
+        chart = await fetch_chart(year, event, format, width, height)
+    except WorkerPoolFullError as e:
+        logger.warning(f"Rejecting chart request for {year} {event}: {e}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except Exception as e:
+        if error_status(e) == 500:
+            logger.error(f"Error rendering qualifying chart: {str(e)}")
+        raise HTTPException(status_code=error_status(e), detail=f"Error rendering qualifying chart: {str(e)}")
+
+    return await conditional_response(request, chart, is_settled_event(ref))
+
+@app.get("/api/f1/telemetry")
+async def get_telemetry(request: Request, year: int = 2024, event: str = "Las Vegas",
+                        drivers: str = "VER,NOR", points: int = 500):
+    """
+    Get speed, throttle and brake traces of the drivers' fastest qualifying laps,
+    aligned on a common distance axis and downsampled to at most `points` samples
+    """
+    driver_list = list(dict.fromkeys(d.strip().upper() for d in drivers.split(",") if d.strip()))
+    if not 1 <= len(driver_list) <= TELEMETRY_MAX_DRIVERS:
+        raise HTTPException(status_code=400, detail=f"Request between 1 and {TELEMETRY_MAX_DRIVERS} drivers")
+    if not 10 <= points <= TELEMETRY_MAX_POINTS:
+        raise HTTPException(status_code=400, detail=f"Points must be between 10 and {TELEMETRY_MAX_POINTS}")
+
+    try:
+        ref = await resolve_event(year, event)
+        entry = await fetch_telemetry(year, event, driver_list, points)
+        return await conditional_response(request, entry, is_settled_event(ref))
+
+    except WorkerPoolFullError as e:
+        logger.warning(f"Rejecting telemetry request for {year} {event}: {e}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except (NoSessionDataError, UnknownEventError) as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error fetching telemetry: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error fetching telemetry: {str(e)}")
+
+@app.post("/api/f1/qualifying/batch")
+async def get_qualifying_batch(request: BatchQualifyingRequest):
+    """
+    Get qualifying results for several events, or every completed event of a season
+    Results are streamed as NDJSON, one line per event in completion order
+    """
+    pairs = [(item.year, item.event) for item in request.events]
+    if request.season is not None:
+        try:
+            schedule = await fetch_events(request.season)
+        except Exception as e:
+            logger.error(f"Error fetching events for batch: {str(e)}")
+            raise HTTPException(status_code=error_status(e), detail=f"Error fetching events: {str(e)}")
+        pairs += [(request.season, event["name"]) for event in completed_events(schedule)]
+
+    # Drop duplicate pairs but keep the requested order
+    pairs = list(dict.fromkeys(pairs))
+    if not pairs:
+        raise HTTPException(status_code=400, detail="No events requested")
+    if len(pairs) > BATCH_MAX_EVENTS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_EVENTS} events per batch")
+
+    logger.info(f"Batch qualifying request for {len(pairs)} events")
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def fetch_one(year: int, event: str) -> bytes:
+        async with semaphore:
+            try:
+                entry = await fetch_qualifying(year, event)
+            except Exception as e:
+                logger.warning(f"Batch fetch failed for {year} {event}: {e}")
+                return dumps({"year": year, "event": event, "status": error_status(e), "error": str(e)}) + b"\n"
+        # Splice the cached, already-encoded payload in instead of re-serializing it
+        head = dumps({"year": year, "event": event, "status": 200})
+        return head[:-1] + b',"data":' + entry.body + b"}\n"
+
+    async def stream():
+        tasks = [asyncio.ensure_future(fetch_one(year, event)) for year, event in pairs]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Client went away: stop waiting on the remaining events
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
 @app.get("/api/f1/events/{year}")
-async def get_events(year: int = 2024):
+async def get_events(request: Request, year: int = 2024):
     """
     Get all F1 events for a specific year
     """
     try:
         logger.info(f"Fetching events for year {year}")
         
-        schedule = fastf1.get_event_schedule(year)
-        events = []
-        
-        for idx, event in schedule.iterrows():
-            events.append({
-                "round": event.get('RoundNumber', idx + 1),
-                "name": event['EventName'],
-                "location": event.get('Location', 'Unknown'),
-                "country": event.get('Country', 'Unknown'),
-                "date": event['Session5Date'].strftime('%Y-%m-%d') if pd.notna(event.get('Session5Date')) else None
-            })
+        entry = await fetch_schedule(year)
         
-        logger.info(f"Found {len(events)} events for {year}")
-        return {"year": year, "events": events}
+        logger.info(f"Found {len(entry.payload['events'])} events for {year}")
+        return await conditional_response(request, entry, is_finished_season(year))
         
+    except WorkerPoolFullError as e:
+        logger.warning(f"Rejecting events request for {year}: {e}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
     except Exception as e:
         logger.error(f"Error fetching events: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching events: {str(e)}")
 
+@app.get("/api/f1/events/{year}/resolve")
+async def resolve_event_name(year: int, q: str):
+    """
+    Resolve a free-text event name, location, country or round to its canonical event
+    """
+    try:
+        ref = await resolve_event(year, q)
+        return {"eventId": ref.event_id, "year": ref.year, "round": ref.round, "name": ref.name, "date": ref.date}
+    except UnknownEventError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error resolving event: {str(e)}")
+        raise HTTPException(status_code=error_status(e), detail=f"Error resolving event: {str(e)}")
+
 @app.get("/api/f1/available-years")
 async def get_available_years():
     """
@@ -198,17 +599,30 @@ async def get_available_years():
         logger.error(f"Error getting available years: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error getting available years: {str(e)}")
 
+@app.get("/api/f1/prewarm/status")
+async def get_prewarm_status():
+    """
+    Get progress of the background season prewarm
+    """
+    return prewarmer.status()
+
 @app.get("/api/f1/cache/info")
 async def get_cache_info():
     """
     Get information about the FastF1 cache
     """
     try:
-        cache_info = fastf1.Cache.get_cache_info()
+        cache_info = await asyncio.to_thread(load_cache_info, cache_dir)
         return {
             "cachePath": cache_info[0] if cache_info[0] else "Not configured",
             "cacheSize": cache_info[1] if cache_info[1] else 0,
-            "cacheSizeMB": round(cache_info[1] / (1024 * 1024), 2) if cache_info[1] else 0
+            "cacheSizeMB": round(cache_info[1] / (1024 * 1024), 2) if cache_info[1] else 0,
+            "resultCache": qualifying_cache.stats(),
+            "sectorsCache": sectors_cache.stats(),
+            "chartCache": chart_cache.stats(),
+            "telemetryCache": telemetry_cache.stats(),
+            "resultStore": result_store.stats(),
+            "diskCache": await asyncio.to_thread(disk_cache.info)
         }
     except Exception as e:
         logger.error(f"Error getting cache info: {str(e)}")
@@ -216,9 +630,12 @@ async def get_cache_info():
             "cachePath": "Error",
             "cacheSize": 0,
             "cacheSizeMB": 0,
+            "resultCache": qualifying_cache.stats(),
+            "resultStore": result_store.stats(),
             "error": str(e)
         }
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
+    # reload needs the import string; see start.py --workers for production
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
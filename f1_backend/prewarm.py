@@ -0,0 +1,140 @@
+"""
+Background prewarming of qualifying results for completed events
+"""
+
+import asyncio
+import logging
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def completed_events(schedule: List[Dict[str, Any]], today: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Events from a formatted schedule whose qualifying has already happened"""
+    today = today or date.today().isoformat()
+    # Round 0 is pre-season testing, which has no qualifying;
+    # qualifying is done once the race date (Session5Date) is reached
+    return [
+        event for event in schedule
+        if event.get("round") and event.get("date") and event["date"] <= today
+    ]
+
+
+class SeasonPrewarmer:
+    """Preloads completed events of the configured seasons, most recent first"""
+
+    def __init__(
+        self,
+        seasons: List[int],
+        fetch_events: Callable[[int], Awaitable[List[Dict[str, Any]]]],
+        fetch_qualifying: Callable[[int, str], Awaitable[Any]],
+        concurrency: int = 2,
+        interval: Optional[float] = None
+    ):
+        self.seasons = seasons
+        self.fetch_events = fetch_events
+        self.fetch_qualifying = fetch_qualifying
+        self.concurrency = max(1, concurrency)
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._reset_status("idle" if seasons else "disabled")
+
+    def _reset_status(self, state: str):
+        self.state = state
+        self.total = 0
+        self.completed = 0
+        self.failed = 0
+        self.in_progress: List[str] = []
+        self.errors: List[Dict[str, str]] = []
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+
+    def start(self):
+        if self.seasons and self._task is None:
+            self._task = asyncio.ensure_future(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Prewarm run failed: {e}")
+                self.state = "failed"
+            if not self.interval:
+                return
+            await asyncio.sleep(self.interval)
+
+    async def events_to_warm(self) -> List[Dict[str, Any]]:
+        """Completed events across the configured seasons, most recent first"""
+        events = []
+        for year in self.seasons:
+            try:
+                schedule = await self.fetch_events(year)
+            except Exception as e:
+                logger.warning(f"Could not fetch schedule for prewarm of {year}: {e}")
+                self.errors.append({"event": str(year), "error": str(e)})
+                continue
+            for event in completed_events(schedule):
+                events.append({"year": year, "name": event["name"], "date": event["date"]})
+
+        events.sort(key=lambda e: e["date"], reverse=True)
+        return events
+
+    async def run_once(self):
+        self._reset_status("running")
+        self.started_at = datetime.now().isoformat()
+
+        events = await self.events_to_warm()
+        self.total = len(events)
+        logger.info(f"Prewarming {self.total} completed events for seasons {self.seasons}")
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def warm(event: Dict[str, Any]):
+            label = f"{event['year']} {event['name']}"
+            async with semaphore:
+                self.in_progress.append(label)
+                try:
+                    await self.fetch_qualifying(event["year"], event["name"])
+                    self.completed += 1
+                except Exception as e:
+                    self.failed += 1
+                    self.errors.append({"event": label, "error": str(e)})
+                    logger.warning(f"Prewarm failed for {label}: {e}")
+                finally:
+                    self.in_progress.remove(label)
+
+        # Tasks are created in priority order, so the semaphore admits the most recent first
+        await asyncio.gather(*(warm(event) for event in events))
+
+        self.state = "done"
+        self.finished_at = datetime.now().isoformat()
+        logger.info(f"Prewarm finished: {self.completed} warmed, {self.failed} failed")
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "seasons": self.seasons,
+            "concurrency": self.concurrency,
+            "intervalSeconds": self.interval,
+            "total": self.total,
+            "completed": self.completed,
+            "failed": self.failed,
+            "progress": round((self.completed + self.failed) / self.total, 4) if self.total else 0.0,
+            "inProgress": list(self.in_progress),
+            "errors": self.errors[-20:],
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at
+        }
@@ -0,0 +1,134 @@
+"""
+Vectorized qualifying result-table pipeline
+Shared by the API loaders and plot_qualifying_results.py
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List
+
+try:
+    from lazy import lazy_import
+except ImportError:  # imported as f1_backend.qualifying by plot_qualifying_results.py
+    from f1_backend.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+DEFAULT_TEAM_COLOR = "#FFFFFF"
+
+SECTOR_COLUMNS = ['Sector1Time', 'Sector2Time', 'Sector3Time']
+SPEED_TRAP_COLUMNS = ['SpeedI1', 'SpeedI2', 'SpeedFL', 'SpeedST']
+
+
+def fastest_laps_table(laps: pd.DataFrame) -> pd.DataFrame:
+    """
+    Each driver's fastest lap sorted by lap time, with LapTimeDelta to pole
+    Equivalent to pick_drivers(drv).pick_fastest() per driver, in one pass:
+    a stable sort by lap time keeps the first row per driver
+    """
+    timed = laps['LapTime'].notna()
+    if 'IsPersonalBest' in laps.columns:
+        # pick_fastest() only considers personal-best laps by default
+        timed &= laps['IsPersonalBest'] == True  # noqa: E712 (column may be object dtype)
+
+    fastest_laps = laps.loc[timed, ['Driver', 'Team', 'LapTime']] \
+        .sort_values(by='LapTime', kind='stable') \
+        .drop_duplicates(subset='Driver', keep='first') \
+        .reset_index(drop=True)
+
+    pole_time = fastest_laps['LapTime'].iloc[0] if len(fastest_laps) else pd.NaT
+    fastest_laps['LapTimeDelta'] = fastest_laps['LapTime'] - pole_time
+    return fastest_laps
+
+
+def team_color_map(teams: Iterable[str], session=None) -> Dict[str, str]:
+    """Look up each team's colour once per session instead of once per lap"""
+    # Replayed sessions (replay.py) carry the colours recorded with them
+    recorded = getattr(session, "team_colors", None)
+    if recorded is None:
+        import fastf1.plotting
+
+    colors = {}
+    for team in pd.unique(pd.Series(list(teams), dtype=object)):
+        if recorded is not None:
+            colors[team] = recorded.get(team, DEFAULT_TEAM_COLOR)
+            continue
+        try:
+            colors[team] = fastf1.plotting.get_team_color(team, session=session)
+        except Exception:
+            colors[team] = DEFAULT_TEAM_COLOR
+    return colors
+
+
+def format_results(fastest_laps: pd.DataFrame, team_colors: Dict[str, str]) -> List[Dict[str, Any]]:
+    """Build the frontend result rows with vectorized time formatting"""
+    lap_times = fastest_laps['LapTime']
+    delta_seconds = fastest_laps['LapTimeDelta'].dt.total_seconds().to_numpy()
+
+    table = pd.DataFrame({
+        "position": np.arange(1, len(fastest_laps) + 1),
+        "driver": fastest_laps['Driver'].to_numpy(),
+        "team": fastest_laps['Team'].to_numpy(),
+        # str(Timedelta) is "0 days 00:01:32.123000"; keep the clock part
+        "lapTime": lap_times.astype(str).str.split().str[-1].where(lap_times.notna(), "N/A").to_numpy(),
+        "timeDelta": np.where(delta_seconds > 0, np.char.mod("+%.3fs", delta_seconds), "Pole"),
+        "teamColor": fastest_laps['Team'].map(team_colors).fillna(DEFAULT_TEAM_COLOR).to_numpy()
+    })
+    return table.to_dict(orient="records")
+
+
+def sector_table(laps: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-driver best sectors, theoretical best lap and speed-trap maxima
+    One groupby over all laps; sorted by theoretical best, with sector deltas
+    to the overall best of each sector
+    """
+    sectors = [c for c in SECTOR_COLUMNS if c in laps.columns]
+    speeds = [c for c in SPEED_TRAP_COLUMNS if c in laps.columns]
+    if 'Deleted' in laps.columns:
+        # Sectors of laps deleted for track limits don't count
+        laps = laps[laps['Deleted'] != True]  # noqa: E712 (column may be object dtype)
+
+    table = laps.groupby('Driver', sort=False).agg(
+        Team=('Team', 'first'),
+        Laps=('LapTime', 'count'),
+        **{c: (c, 'min') for c in sectors},
+        **{c: (c, 'max') for c in speeds}
+    )
+
+    # A driver missing any sector time has no theoretical best
+    table['TheoreticalBest'] = table[sectors].sum(axis=1, min_count=len(sectors)) if sectors else pd.NaT
+    for column in sectors:
+        table[f'{column}Delta'] = table[column] - table[column].min()
+
+    return table.sort_values(by='TheoreticalBest', kind='stable').reset_index()
+
+
+def format_sectors(sectors: pd.DataFrame, fastest_laps: pd.DataFrame,
+                   team_colors: Dict[str, str]) -> List[Dict[str, Any]]:
+    """Build the frontend sector rows; times are seconds, speeds km/h"""
+    best_laps = sectors['Driver'].map(fastest_laps.set_index('Driver')['LapTime'])
+
+    def seconds(values: pd.Series) -> pd.Series:
+        return values.dt.total_seconds().round(3)
+
+    table = pd.DataFrame({
+        "driver": sectors['Driver'],
+        "team": sectors['Team'],
+        "teamColor": sectors['Team'].map(team_colors).fillna(DEFAULT_TEAM_COLOR),
+        "laps": sectors['Laps'],
+        "bestLap": seconds(best_laps),
+        "theoreticalBest": seconds(sectors['TheoreticalBest']),
+        "potentialGain": seconds(best_laps - sectors['TheoreticalBest'])
+    })
+    for number, column in enumerate(SECTOR_COLUMNS, start=1):
+        if column in sectors.columns:
+            table[f"sector{number}"] = seconds(sectors[column])
+            table[f"sector{number}Delta"] = seconds(sectors[f'{column}Delta'])
+    for column in SPEED_TRAP_COLUMNS:
+        if column in sectors.columns:
+            table[f"speed{column[len('Speed'):]}"] = sectors[column].round(1)
+
+    # NaN/NaT (no time set) become null in the JSON payload
+    return table.astype(object).where(table.notna(), None).to_dict(orient="records")
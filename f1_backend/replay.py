@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Recorded FastF1 session snapshots for offline runs (CI, load tests, benchmarks)
+A bundle is a directory of zstd-compressed Arrow files plus manifest.json;
+ReplayBundle serves it through the subset of the fastf1 API the loaders use
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow.feather as feather
+
+BUNDLE_VERSION = 1
+MANIFEST = "manifest.json"
+
+# Columns the service reads; everything else in session.laps is left out
+LAP_COLUMNS = [
+    'Driver', 'DriverNumber', 'Team', 'LapNumber', 'LapTime', 'IsPersonalBest', 'Deleted',
+    'Sector1Time', 'Sector2Time', 'Sector3Time', 'SpeedI1', 'SpeedI2', 'SpeedFL', 'SpeedST', 'Compound'
+]
+RESULT_COLUMNS = [
+    'DriverNumber', 'Abbreviation', 'FullName', 'TeamName', 'TeamColor', 'Position', 'Q1', 'Q2', 'Q3'
+]
+CAR_DATA_COLUMNS = ['Time', 'Speed', 'Throttle', 'Brake', 'nGear', 'RPM', 'DRS', 'Distance']
+
+
+def _write_frame(path: str, frame: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Write a frame as compressed Arrow; returns its manifest entry
+    Object columns of timezone-aware Timestamps (schedule session dates in
+    local time) are stored as ISO strings and restored on read
+    """
+    frame = frame.reset_index(drop=True)
+    timestamps = [
+        column for column in frame.columns
+        if frame[column].dtype == object and frame[column].map(lambda v: isinstance(v, pd.Timestamp)).any()
+    ]
+    for column in timestamps:
+        frame[column] = frame[column].map(lambda v: v.isoformat() if isinstance(v, pd.Timestamp) else None)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    feather.write_feather(frame, path, compression="zstd")
+    return {"file": os.path.basename(path), "rows": len(frame), "timestampColumns": timestamps}
+
+
+def _read_frame(path: str, entry: Dict[str, Any]) -> pd.DataFrame:
+    frame = feather.read_table(path, memory_map=True).to_pandas()
+    for column in entry.get("timestampColumns", []):
+        frame[column] = frame[column].map(lambda v: pd.Timestamp(v) if v else pd.NaT)
+    return frame
+
+
+class ReplayTelemetry(pd.DataFrame):
+    """Recorded car data; Distance was added when recording"""
+
+    @property
+    def _constructor(self):
+        return ReplayTelemetry
+
+    def add_distance(self) -> "ReplayTelemetry":
+        return self
+
+
+class ReplayLap(pd.Series):
+    _metadata = ["session"]
+
+    @property
+    def _constructor(self):
+        return ReplayLap
+
+    def get_car_data(self, **kwargs) -> ReplayTelemetry:
+        return self.session._car_data(self['Driver'])
+
+
+class ReplayLaps(pd.DataFrame):
+    _metadata = ["session"]
+
+    @property
+    def _constructor(self):
+        return ReplayLaps
+
+    @property
+    def _constructor_sliced(self):
+        return ReplayLap
+
+    def pick_drivers(self, identifiers) -> "ReplayLaps":
+        identifiers = [identifiers] if isinstance(identifiers, str) else list(identifiers)
+        selected = self['Driver'].isin(identifiers)
+        if 'DriverNumber' in self.columns:
+            selected |= self['DriverNumber'].isin(identifiers)
+        return self[selected]
+
+    def pick_fastest(self, only_by_time: bool = False) -> Optional[ReplayLap]:
+        laps = self[self['LapTime'].notna()]
+        if not only_by_time and 'IsPersonalBest' in laps.columns:
+            laps = laps[laps['IsPersonalBest'] == True]  # noqa: E712 (column may be object dtype)
+        if laps.empty:
+            return None
+        lap = laps.loc[laps['LapTime'].idxmin()]
+        lap.session = self.session
+        return lap
+
+
+class ReplayEvent(pd.Series):
+    _metadata = ["year"]
+
+    @property
+    def _constructor(self):
+        return ReplayEvent
+
+
+class ReplaySession:
+    """A recorded session; load() reads the laps and results from the bundle"""
+
+    def __init__(self, bundle: "ReplayBundle", year: int, round_number: int, identifier: str):
+        self.bundle = bundle
+        self.identifier = identifier
+        self._entry = bundle._session_entry(year, round_number, identifier)
+        self._dir = os.path.join(bundle.root, str(year))
+
+        schedule = bundle.get_event_schedule(year)
+        self.event = ReplayEvent(schedule.loc[schedule['RoundNumber'] == round_number].iloc[0])
+        self.event.year = year
+        self.name = self._entry.get("name", identifier)
+        # Colours recorded with the session, used by qualifying.team_color_map
+        self.team_colors: Dict[str, str] = self._entry.get("teamColors", {})
+        self.laps: Optional[ReplayLaps] = None
+        self.results: Optional[pd.DataFrame] = None
+
+    def load(self, laps: bool = True, telemetry: bool = True, weather: bool = True, messages: bool = True):
+        self.laps = ReplayLaps(self._read("laps"))
+        self.laps.session = self
+        self.results = self._read("results")
+
+    def _read(self, table: str) -> pd.DataFrame:
+        entry = self._entry[table]
+        return _read_frame(os.path.join(self._dir, entry["file"]), entry)
+
+    def _car_data(self, driver: str) -> ReplayTelemetry:
+        entry = self._entry.get("carData", {}).get(driver)
+        if entry is None:
+            raise KeyError(f"No car data recorded for {driver} in {self.event['EventName']}")
+        return ReplayTelemetry(_read_frame(os.path.join(self._dir, entry["file"]), entry))
+
+
+class _ReplayCache:
+    """Stands in for fastf1.Cache; a bundle needs no cache directory"""
+
+    def __init__(self, bundle: "ReplayBundle"):
+        self._bundle = bundle
+
+    def enable_cache(self, cache_dir: str, **kwargs):
+        pass
+
+    def get_cache_info(self) -> Tuple[str, int]:
+        return self._bundle.root, self._bundle.size()
+
+
+class ReplayBundle:
+    """
+    Serves get_session, get_event_schedule and Cache from a snapshot bundle,
+    so it can be used in place of the fastf1 module (F1_REPLAY_BUNDLE)
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        with open(os.path.join(root, MANIFEST)) as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("version") != BUNDLE_VERSION:
+            raise ValueError(f"Unsupported replay bundle version in {root}: {self.manifest.get('version')}")
+        self.Cache = _ReplayCache(self)
+        self._schedules: Dict[int, pd.DataFrame] = {}
+
+    def _season(self, year: int) -> Dict[str, Any]:
+        season = self.manifest["seasons"].get(str(year))
+        if season is None:
+            raise ValueError(f"Season {year} is not in the replay bundle")
+        return season
+
+    def _session_entry(self, year: int, round_number: int, identifier: str) -> Dict[str, Any]:
+        entry = self._season(year)["sessions"].get(f"{round_number:02d}_{identifier}")
+        if entry is None:
+            raise ValueError(f"Session {year} round {round_number} {identifier} is not in the replay bundle")
+        return entry
+
+    def get_event_schedule(self, year: int, include_testing: bool = True) -> pd.DataFrame:
+        if year not in self._schedules:
+            entry = self._season(year)["schedule"]
+            self._schedules[year] = _read_frame(os.path.join(self.root, str(year), entry["file"]), entry)
+        schedule = self._schedules[year]
+        if not include_testing:
+            schedule = schedule[schedule['RoundNumber'] > 0]
+        return schedule.copy()
+
+    def get_session(self, year: int, gp, identifier: str = 'Q') -> ReplaySession:
+        schedule = self.get_event_schedule(year, include_testing=False)
+        if isinstance(gp, str) and not gp.isdigit():
+            matches = schedule[schedule['EventName'].str.lower().str.contains(gp.lower(), regex=False)]
+            if matches.empty:
+                raise ValueError(f"No event matching '{gp}' in the {year} replay bundle")
+            round_number = int(matches['RoundNumber'].iloc[0])
+        else:
+            round_number = int(gp)
+        return ReplaySession(self, year, round_number, identifier)
+
+    def size(self) -> int:
+        return sum(
+            os.path.getsize(os.path.join(dirpath, name))
+            for dirpath, _, names in os.walk(self.root) for name in names
+        )
+
+
+def record_session(root: str, year: int, round_number: int, identifier: str = 'Q',
+                   telemetry: bool = False) -> Dict[str, Any]:
+    """Load one live session and write its laps, results and (optionally) fastest-lap car data"""
+    import fastf1
+    import fastf1.plotting
+
+    session = fastf1.get_session(year, round_number, identifier)
+    session.load(laps=True, telemetry=telemetry, weather=False, messages=False)
+    prefix = os.path.join(root, str(year), f"{round_number:02d}_{identifier}")
+
+    laps = session.laps[[c for c in LAP_COLUMNS if c in session.laps.columns]]
+    results = session.results[[c for c in RESULT_COLUMNS if c in session.results.columns]]
+    entry = {
+        "name": session.name,
+        "event": session.event['EventName'],
+        "laps": _write_frame(f"{prefix}_laps.arrow", pd.DataFrame(laps)),
+        "results": _write_frame(f"{prefix}_results.arrow", pd.DataFrame(results)),
+        "teamColors": {}
+    }
+
+    for team in laps['Team'].dropna().unique():
+        try:
+            entry["teamColors"][team] = fastf1.plotting.get_team_color(team, session=session)
+        except Exception:
+            pass
+
+    if telemetry:
+        entry["carData"] = {}
+        for driver in laps['Driver'].dropna().unique():
+            lap = session.laps.pick_drivers(driver).pick_fastest()
+            if lap is None or lap.empty:
+                continue
+            car_data = lap.get_car_data().add_distance()
+            car_data = pd.DataFrame(car_data[[c for c in CAR_DATA_COLUMNS if c in car_data.columns]])
+            # float32 is plenty for speed, throttle and distance and halves the bundle
+            car_data = car_data.astype({c: "float32" for c in car_data.columns if car_data[c].dtype == "float64"})
+            entry["carData"][driver] = _write_frame(f"{prefix}_car_{driver}.arrow", car_data)
+    return entry
+
+
+def record_bundle(root: str, seasons: List[int], events: Optional[List[str]] = None,
+                  telemetry: bool = False, cache_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Record the schedule and qualifying sessions of the given seasons into a bundle
+    events limits recording to those round numbers or names; default: every completed event
+    """
+    import fastf1
+
+    if cache_dir:
+        fastf1.Cache.enable_cache(cache_dir)
+
+    manifest_path = os.path.join(root, MANIFEST)
+    manifest = {"version": BUNDLE_VERSION, "seasons": {}}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    for year in seasons:
+        schedule = fastf1.get_event_schedule(year)
+        season = manifest["seasons"].setdefault(str(year), {"sessions": {}})
+        season["schedule"] = _write_frame(os.path.join(root, str(year), "schedule.arrow"), pd.DataFrame(schedule))
+
+        now = datetime.now()
+        for _, event in schedule.iterrows():
+            round_number = int(event['RoundNumber'])
+            if not round_number or event['EventDate'].to_pydatetime() > now:
+                continue  # testing, or not run yet
+            if events and str(round_number) not in events and \
+                    not any(e.lower() in event['EventName'].lower() for e in events):
+                continue
+            print(f"Recording {year} round {round_number} {event['EventName']}")
+            season["sessions"][f"{round_number:02d}_Q"] = record_session(
+                root, year, round_number, 'Q', telemetry=telemetry)
+
+    manifest["version"] = BUNDLE_VERSION
+    manifest["recorded"] = datetime.now().isoformat(timespec="seconds")
+    manifest["fastf1Version"] = getattr(fastf1, "__version__", "unknown")
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record FastF1 sessions into an offline replay bundle")
+    parser.add_argument("--bundle", required=True, help="bundle directory (created or extended)")
+    parser.add_argument("--season", type=int, nargs="+", required=True)
+    parser.add_argument("--events", nargs="+", help="round numbers or event names (default: all completed)")
+    parser.add_argument("--telemetry", action="store_true",
+                        help="also record each driver's fastest-lap car data for /api/f1/telemetry")
+    parser.add_argument("--cache", default=None, help="FastF1 cache directory to record from")
+    args = parser.parse_args()
+
+    manifest = record_bundle(args.bundle, args.season, events=args.events,
+                             telemetry=args.telemetry, cache_dir=args.cache)
+    sessions = sum(len(s["sessions"]) for s in manifest["seasons"].values())
+    size = ReplayBundle(args.bundle).size()
+    print(f"Bundle {args.bundle}: {sessions} sessions, {size / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Bounded in-memory cache for computed F1 API payloads
+Entries are evicted least-recently-used first and can carry their own TTL
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# Sentinel so callers can pass ttl=None to mean "never expires"
+_DEFAULT_TTL = object()
+
+
+class ResultCache:
+    """LRU cache with per-entry expiry and hit/miss counters"""
+
+    def __init__(self, max_entries: int = 256, ttl: Optional[float] = 300.0):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired"""
+        entry = self.get_with_age(key)
+        return entry[0] if entry is not None else None
+
+    def get_with_age(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        """Return (value, seconds since it was stored) for key, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at, stored_at = entry
+            now = time.monotonic()
+            if expires_at is not None and expires_at <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value, now - stored_at
+
+    def set(self, key: Hashable, value: Any, ttl: Any = _DEFAULT_TTL):
+        """Store value under key; ttl=None keeps the entry until it is evicted"""
+        if ttl is _DEFAULT_TTL:
+            ttl = self.ttl
+        now = time.monotonic()
+        expires_at = now + ttl if ttl is not None else None
+
+        with self._lock:
+            self._entries[key] = (value, expires_at, now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "maxEntries": self.max_entries,
+                "ttlSeconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
@@ -0,0 +1,107 @@
+"""
+Persistent columnar store of derived per-event session tables
+Tables are Arrow IPC files, so a restarted worker can memory-map a few KB
+instead of re-loading the full FastF1 session
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from lazy import lazy_import
+
+pd = lazy_import("pandas")
+pa = lazy_import("pyarrow")
+
+logger = logging.getLogger(__name__)
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", str(value).lower()).strip("_") or "event"
+
+
+class ResultStore:
+    """Arrow IPC files laid out as <root>/<year>/<event>_<session>.arrow"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.errors = 0
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, year: int, event: str, session: str) -> str:
+        return os.path.join(self.root, str(year), f"{_slug(event)}_{_slug(session)}.arrow")
+
+    def load_table(self, year: int, event: str, session: str,
+                   max_age: Optional[float] = None) -> Optional[Tuple[pd.DataFrame, Dict[str, str]]]:
+        """Return (table, metadata) for a stored session, or None if absent or older than max_age seconds"""
+        path = self.path_for(year, event, session)
+        try:
+            if max_age is not None and time.time() - os.path.getmtime(path) > max_age:
+                self._count("misses")
+                return None
+            with pa.memory_map(path, "r") as source:
+                table = pa.ipc.open_file(source).read_all()
+        except FileNotFoundError:
+            self._count("misses")
+            return None
+        except Exception as e:
+            logger.warning(f"Could not read derived results {path}: {e}")
+            self._count("errors")
+            return None
+
+        metadata = {k.decode(): v.decode() for k, v in (table.schema.metadata or {}).items()}
+        self._count("hits")
+        return table.to_pandas(), metadata
+
+    def save_table(self, year: int, event: str, session: str, frame: pd.DataFrame, metadata: Dict[str, Any]):
+        """Atomically write a derived table so readers never see a partial file"""
+        path = self.path_for(year, event, session)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        table = table.replace_schema_metadata({str(k): str(v) for k, v in metadata.items()})
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            self._count("errors")
+            raise
+        self._count("writes")
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def counts(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "writes": self.writes, "errors": self.errors}
+
+    def merge_counts(self, counts: Dict[str, int]):
+        """Add counters reported by a store opened in a pool worker"""
+        with self._lock:
+            for counter, value in counts.items():
+                setattr(self, counter, getattr(self, counter) + value)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.root,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "errors": self.errors
+        }
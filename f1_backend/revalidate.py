@@ -0,0 +1,88 @@
+"""
+Stale-while-revalidate: background refreshes of cached payloads past their
+freshness window, deduplicated and rate-limited per key
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Refresh timestamps are pruned once this many keys are tracked
+_MAX_TRACKED = 1024
+
+
+class Revalidator:
+    """Starts at most one refresh per key, no more often than min_interval"""
+
+    def __init__(self, min_interval: float = 60, concurrency: int = 2):
+        self.min_interval = min_interval
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        self._last_started: Dict[Hashable, float] = {}
+        self.started = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.deduplicated = 0
+        self.rate_limited = 0
+
+    def maybe_refresh(self, key: Hashable, age: float, freshness: Optional[float],
+                      refresh: Callable[[], Awaitable[Any]]) -> bool:
+        """
+        Schedule refresh() if an entry of this age is stale (freshness=None: never)
+        Returns whether a refresh was started; the caller serves the cached entry either way
+        """
+        if freshness is None or age < freshness:
+            return False
+        if key in self._tasks:
+            self.deduplicated += 1
+            return False
+
+        now = time.monotonic()
+        last = self._last_started.get(key)
+        if last is not None and now - last < self.min_interval:
+            self.rate_limited += 1
+            return False
+
+        if len(self._last_started) >= _MAX_TRACKED:
+            self._last_started = {
+                k: t for k, t in self._last_started.items() if now - t < self.min_interval
+            }
+        self._last_started[key] = now
+        self._tasks[key] = asyncio.ensure_future(self._run(key, refresh))
+        self.started += 1
+        return True
+
+    async def _run(self, key: Hashable, refresh: Callable[[], Awaitable[Any]]):
+        try:
+            async with self._semaphore:
+                await refresh()
+            self.succeeded += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # The stale entry keeps being served; the next request after
+            # min_interval tries again
+            self.failed += 1
+            logger.warning(f"Background refresh of {key} failed: {e}")
+        finally:
+            self._tasks.pop(key, None)
+
+    async def stop(self):
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "inFlight": len(self._tasks),
+            "started": self.started,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "deduplicated": self.deduplicated,
+            "rateLimited": self.rate_limited,
+            "minIntervalSeconds": self.min_interval
+        }
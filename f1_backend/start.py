@@ -1,3 +1,4 @@
+import argparse
 import uvicorn
 import os
 import sys
@@ -5,17 +6,35 @@ import sys
 # Add the current directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Start the F1 Qualifying Results API")
+    parser.add_argument("--prod", action="store_true",
+                        help="production mode: several worker processes, no auto-reload")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("F1_WORKERS", "0")),
+                        help="worker processes in production mode (default: F1_WORKERS or CPU count)")
+    parser.add_argument("--host", default=os.getenv("F1_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("F1_PORT", "8000")))
+    return parser.parse_args()
+
 if __name__ == "__main__":
+    args = parse_args()
+    # Workers share the FastF1 cache and result store on disk and
+    # coordinate session loads through lock files in cache/.locks
+    workers = (args.workers or os.cpu_count() or 1) if args.prod else 1
+
     print("🏎️ Starting F1 Qualifying Results API...")
-    print("📍 Server will be available at: http://localhost:8000")
-    print("📚 API Documentation: http://localhost:8000/docs")
-    print("🔍 Health Check: http://localhost:8000/health")
+    print(f"📍 Server will be available at: http://localhost:{args.port}")
+    print(f"📚 API Documentation: http://localhost:{args.port}/docs")
+    print(f"🔍 Health Check: http://localhost:{args.port}/health")
+    if args.prod:
+        print(f"⚙️  Production mode with {workers} workers")
     print("=" * 50)
-    
+
     uvicorn.run(
-        "main:app", 
-        host="0.0.0.0", 
-        port=8000, 
-        reload=True,
+        "main:app",
+        host=args.host,
+        port=args.port,
+        reload=not args.prod,
+        workers=workers,
         log_level="info"
     )
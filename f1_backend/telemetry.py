@@ -0,0 +1,96 @@
+"""
+Distance-aligned, downsampled lap telemetry for driver comparisons
+Traces are resampled onto one distance grid with np.interp, then reduced with LTTB
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Sequence, Tuple
+
+from lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+# Car data channels sent to the frontend, with the decimals they are rounded to
+CHANNELS = {"Speed": 1, "Throttle": 0, "Brake": 0}
+
+# Upper bound on the common grid; raw car data rarely needs more than this
+MAX_GRID_POINTS = 20000
+
+
+def lttb_indices(x: np.ndarray, ys: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets point selection over one or more series
+    sharing the x axis: each bucket keeps the point whose triangle area,
+    summed over the (range-normalized) series, is largest
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    ys = np.atleast_2d(np.asarray(ys, dtype=float))
+    spans = np.ptp(ys, axis=1, keepdims=True)
+    ys = (ys - ys.min(axis=1, keepdims=True)) / np.where(spans > 0, spans, 1.0)
+
+    # n_out - 2 buckets between the fixed first and last points
+    bounds = np.append(np.linspace(1, n - 1, n_out - 1).astype(int), n)
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = bounds[i], bounds[i + 1]
+        next_start, next_end = bounds[i + 1], bounds[i + 2]
+        avg_x = x[next_start:next_end].mean()
+        avg_y = ys[:, next_start:next_end].mean(axis=1, keepdims=True)
+
+        area = np.abs(
+            (x[a] - avg_x) * (ys[:, start:end] - ys[:, [a]])
+            - (x[a] - x[start:end]) * (avg_y - ys[:, [a]])
+        ).sum(axis=0)
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def align_traces(traces: Sequence[pd.DataFrame]) -> Tuple[np.ndarray, List[Dict[str, np.ndarray]]]:
+    """
+    Resample car data (with a Distance column) onto a common distance grid
+    The grid ends at the shortest lap so no trace is extrapolated
+    """
+    lap_length = min(float(trace['Distance'].iloc[-1]) for trace in traces)
+    grid_points = min(max(len(trace) for trace in traces), MAX_GRID_POINTS)
+    grid = np.linspace(0.0, lap_length, grid_points)
+
+    aligned = []
+    for trace in traces:
+        distance = trace['Distance'].to_numpy(dtype=float)
+        aligned.append({
+            channel: np.interp(grid, distance, trace[channel].to_numpy(dtype=float))
+            for channel in CHANNELS
+        })
+    return grid, aligned
+
+
+def downsample_traces(traces: Sequence[pd.DataFrame], points: int) -> Tuple[List[float], List[Dict[str, list]]]:
+    """
+    Align traces by distance and keep at most `points` samples, chosen by LTTB
+    over every channel of every driver so no trace loses its braking points
+    """
+    grid, aligned = align_traces(traces)
+    stacked = np.vstack([trace[channel] for trace in aligned for channel in CHANNELS])
+    keep = lttb_indices(grid, stacked, points)
+
+    distance = np.round(grid[keep], 1).tolist()
+    series = [
+        {channel.lower(): _rounded(trace[channel][keep], decimals) for channel, decimals in CHANNELS.items()}
+        for trace in aligned
+    ]
+    return distance, series
+
+
+def _rounded(values: np.ndarray, decimals: int) -> list:
+    """Round for the payload; whole numbers are sent as ints to keep it small"""
+    values = np.round(values, decimals)
+    return (values.astype(int) if decimals == 0 else values).tolist()
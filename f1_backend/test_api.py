@@ -117,6 +117,81 @@ def test_events():
     except Exception as e:
         print(f"❌ Events endpoint error: {e}")
 
+def test_resolve_event():
+    """Test the event name resolution endpoint"""
+    print("\n🔎 Testing event resolution endpoint...")
+    try:
+        response = requests.get(f"{API_BASE_URL}/api/f1/events/2024/resolve", params={"q": "vegas"})
+        if response.status_code == 200:
+            print("✅ Event resolution endpoint passed")
+            data = response.json()
+            print(f"   'vegas' -> {data['eventId']} {data['name']}")
+        else:
+            print(f"❌ Event resolution endpoint failed: {response.status_code}")
+    except Exception as e:
+        print(f"❌ Event resolution endpoint error: {e}")
+
+def test_qualifying_sectors():
+    """Test the sector and speed-trap analytics endpoint"""
+    print("\n⏱️  Testing qualifying sectors endpoint...")
+    try:
+        response = requests.get(f"{API_BASE_URL}/api/f1/qualifying/sectors", params={"year": 2024, "event": "Las Vegas"})
+        if response.status_code == 200:
+            print("✅ Qualifying sectors endpoint passed")
+            data = response.json()
+            best = data['drivers'][0] if data['drivers'] else {}
+            print(f"   Best theoretical lap: {best.get('driver')} {best.get('theoreticalBest')}s")
+        else:
+            print(f"❌ Qualifying sectors endpoint failed: {response.status_code}")
+    except Exception as e:
+        print(f"❌ Qualifying sectors endpoint error: {e}")
+
+def test_qualifying_chart():
+    """Test the rendered qualifying chart endpoint"""
+    print("\n🖼️  Testing qualifying chart endpoint...")
+    try:
+        params = {"year": 2024, "event": "Las Vegas", "format": "png", "width": 800, "height": 600}
+        response = requests.get(f"{API_BASE_URL}/api/f1/qualifying/chart", params=params)
+        if response.status_code == 200:
+            print("✅ Qualifying chart endpoint passed")
+            print(f"   {response.headers['content-type']}, {len(response.content)} bytes")
+        else:
+            print(f"❌ Qualifying chart endpoint failed: {response.status_code}")
+    except Exception as e:
+        print(f"❌ Qualifying chart endpoint error: {e}")
+
+def test_telemetry():
+    """Test the downsampled telemetry endpoint"""
+    print("\n📈 Testing telemetry endpoint...")
+    try:
+        params = {"year": 2024, "event": "Las Vegas", "drivers": "VER,NOR", "points": 500}
+        response = requests.get(f"{API_BASE_URL}/api/f1/telemetry", params=params)
+        if response.status_code == 200:
+            print("✅ Telemetry endpoint passed")
+            data = response.json()
+            print(f"   {data['points']} points for {[d['driver'] for d in data['drivers']]}, {len(response.content)} bytes")
+        else:
+            print(f"❌ Telemetry endpoint failed: {response.status_code}")
+    except Exception as e:
+        print(f"❌ Telemetry endpoint error: {e}")
+
+def test_batch_qualifying():
+    """Test the streaming batch qualifying endpoint"""
+    print("\n📦 Testing batch qualifying endpoint...")
+    try:
+        payload = {"events": [{"year": 2024, "event": "Las Vegas"}, {"year": 2024, "event": "Azerbaijan"}]}
+        with requests.post(f"{API_BASE_URL}/api/f1/qualifying/batch", json=payload, stream=True) as response:
+            if response.status_code == 200:
+                print("✅ Batch qualifying endpoint passed")
+                for line in response.iter_lines():
+                    if line:
+                        item = json.loads(line)
+                        print(f"   {item['year']} {item['event']}: {item['status']}")
+            else:
+                print(f"❌ Batch qualifying endpoint failed: {response.status_code}")
+    except Exception as e:
+        print(f"❌ Batch qualifying endpoint error: {e}")
+
 def main():
     """Run all tests"""
     print("🧪 F1 Qualifying Results API Test Suite")
@@ -133,7 +208,12 @@ def main():
     test_available_years()
     test_cache_info()
     test_events()
+    test_resolve_event()
     test_qualifying_results()
+    test_qualifying_sectors()
+    test_qualifying_chart()
+    test_telemetry()
+    test_batch_qualifying()
     
     print("\n" + "=" * 50)
     print("🎉 Test suite completed!")
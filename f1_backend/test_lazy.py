@@ -0,0 +1,54 @@
+"""
+Regression tests for lazy.lazy_import: concurrent first access from a thread
+pool must see the fully initialised module
+"""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from lazy import lazy_import
+
+THREADS = 8
+
+
+def _write_slow_module(tmp_path, name: str):
+    # The sleep widens the window in which other threads could observe a
+    # half-initialised module
+    (tmp_path / f"{name}.py").write_text(
+        "import time\n"
+        "time.sleep(0.2)\n"
+        "VALUE = 42\n"
+        "class Cache:\n"
+        "    enabled = True\n"
+    )
+
+
+def test_concurrent_first_access(tmp_path, monkeypatch):
+    _write_slow_module(tmp_path, "lazy_slow_target")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = lazy_import("lazy_slow_target")
+    try:
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            results = list(pool.map(lambda _: (module.VALUE, module.Cache.enabled), range(THREADS)))
+        assert results == [(42, True)] * THREADS
+    finally:
+        sys.modules.pop("lazy_slow_target", None)
+
+
+def test_concurrent_first_access_from_pool_initializer(tmp_path, monkeypatch):
+    # Mirrors init_worker: a failing initializer leaves the pool unusable
+    _write_slow_module(tmp_path, "lazy_slow_initializer")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = lazy_import("lazy_slow_initializer")
+    seen = []
+    try:
+        with ThreadPoolExecutor(max_workers=THREADS, initializer=lambda: seen.append(module.Cache.enabled)) as pool:
+            assert list(pool.map(lambda _: module.VALUE, range(THREADS * 2))) == [42] * THREADS * 2
+        assert seen and all(seen)
+    finally:
+        sys.modules.pop("lazy_slow_initializer", None)
+
+
+def test_attributes_resolve_after_load():
+    json_module = lazy_import("json")
+    assert json_module.loads("[1]") == [1]
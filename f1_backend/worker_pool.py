@@ -0,0 +1,94 @@
+"""
+Executor wrapper for running blocking FastF1 work off the event loop
+"""
+
+import asyncio
+import functools
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerPoolFullError(Exception):
+    """Raised when the pool already has max_queue jobs pending"""
+
+
+class WorkerPool:
+    """Thread or process pool with a bound on queued + running jobs"""
+
+    def __init__(
+        self,
+        mode: str = "thread",
+        max_workers: Optional[int] = None,
+        max_queue: int = 32,
+        initializer: Optional[Callable] = None,
+        initargs: tuple = ()
+    ):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown worker mode: {mode}")
+
+        self.mode = mode
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max(1, max_queue)
+        self._initializer = initializer
+        self._initargs = initargs
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=self._initializer,
+                    initargs=self._initargs
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="f1-worker",
+                    initializer=self._initializer,
+                    initargs=self._initargs
+                )
+            logger.info(f"Started {self.mode} pool with {self.max_workers} workers")
+        return self._executor
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) in the pool and await its result"""
+        if self._pending >= self.max_queue:
+            self.rejected += 1
+            raise WorkerPoolFullError(f"Worker pool queue is full ({self.max_queue} jobs pending)")
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_executor(), functools.partial(fn, *args, **kwargs))
+            self.completed += 1
+            return result
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self._pending -= 1
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "maxWorkers": self.max_workers,
+            "maxQueue": self.max_queue,
+            "pending": self._pending,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected
+        }
@@ -0,0 +1,140 @@
+"""
+Long-lived HTTP client for the upstream backend client, shared by all
+requests so connections (and their TCP/TLS handshakes) are reused
+"""
+
+import importlib.util
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class BackendClient:
+    """Pooled httpx.AsyncClient, created on startup and closed on shutdown"""
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 30.0,
+        connect_timeout: float = 5.0,
+        max_connections: int = 100,
+        max_keepalive: int = 20,
+        keepalive_expiry: float = 60.0,
+        http2: bool = True
+    ):
+        self.base_url = base_url
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry
+        )
+        # HTTP/2 needs the optional h2 package (httpx[http2])
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        if http2 and not self.http2:
+            logger.warning("h2 is not installed; using HTTP/1.1 for the backend client")
+        self._client: Optional[httpx.AsyncClient] = None
+
+        self.requests = 0
+        self.failures = 0
+        self.in_flight = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+        self._latency_total = 0.0
+
+    async def start(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2
+            )
+            logger.info(f"Backend client pool started for {self.base_url} (HTTP/2: {self.http2})")
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _trace(self, event_name: str, info: Dict[str, Any]):
+        # httpcore reports each new connection; reused ones skip these events
+        if event_name == "connection.connect_tcp.complete":
+            self.connections_opened += 1
+        elif event_name == "connection.start_tls.complete":
+            self.tls_handshakes += 1
+
+    async def request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send a request through the shared pool; timeout may be overridden per call"""
+        if self._client is None:
+            raise RuntimeError("Backend client is not started")
+
+        extensions = kwargs.pop("extensions", {})
+        extensions["trace"] = self._trace
+        self.requests += 1
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            return await self._client.request(method, path, extensions=extensions, **kwargs)
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self._latency_total += time.perf_counter() - started
+
+    @asynccontextmanager
+    async def stream(self, method: str, path: str, **kwargs) -> AsyncIterator[httpx.Response]:
+        """Like request, but the body is read incrementally inside the context"""
+        if self._client is None:
+            raise RuntimeError("Backend client is not started")
+
+        extensions = kwargs.pop("extensions", {})
+        extensions["trace"] = self._trace
+        self.requests += 1
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            async with self._client.stream(method, path, extensions=extensions, **kwargs) as response:
+                yield response
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self._latency_total += time.perf_counter() - started
+
+    async def get(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", path, **kwargs)
+
+    def _pool_connections(self) -> Optional[list]:
+        # httpx does not expose its pool; read httpcore's connection list if present
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        return getattr(pool, "connections", None)
+
+    def stats(self) -> Dict[str, Any]:
+        connections = self._pool_connections()
+        completed = self.requests - self.in_flight
+        return {
+            "started": self._client is not None,
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_expiry": self.limits.keepalive_expiry,
+            "open_connections": len(connections) if connections is not None else None,
+            "idle_connections": sum(c.is_idle() for c in connections) if connections is not None else None,
+            "connections_opened": self.connections_opened,
+            "tls_handshakes": self.tls_handshakes,
+            "requests": self.requests,
+            "failures": self.failures,
+            "in_flight": self.in_flight,
+            "avg_latency_ms": round(self._latency_total / completed * 1000, 1) if completed else None
+        }
@@ -0,0 +1,113 @@
+"""
+Helpers for the streaming chat endpoint: relaying upstream chunks (SSE,
+NDJSON or a plain JSON reply) and framing them as SSE events or NDJSON lines
+"""
+
+import json
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+SSE = "sse"
+NDJSON = "ndjson"
+STREAM_MEDIA_TYPES = {
+    SSE: "text/event-stream",
+    NDJSON: "application/x-ndjson"
+}
+
+# Ask the upstream for a stream, but accept a complete JSON reply as well
+UPSTREAM_ACCEPT = "text/event-stream, application/x-ndjson;q=0.9, application/json;q=0.5"
+
+# Keys an upstream chunk may carry its text under, in order of preference
+_TEXT_KEYS = ("delta", "token", "content", "text", "message")
+
+
+def stream_format(accept: Optional[str]) -> str:
+    """NDJSON if the client asks for it, otherwise Server-Sent Events"""
+    if accept and STREAM_MEDIA_TYPES[NDJSON] in accept and STREAM_MEDIA_TYPES[SSE] not in accept:
+        return NDJSON
+    return SSE
+
+
+def encode_event(fmt: str, event: str, data: Dict[str, Any]) -> bytes:
+    """One SSE event, or one NDJSON line carrying the event name"""
+    if fmt == NDJSON:
+        return (json.dumps({"event": event, **data}) + "\n").encode()
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+
+def chunk_text(chunk: Dict[str, Any]) -> str:
+    for key in _TEXT_KEYS:
+        value = chunk.get(key)
+        if isinstance(value, str):
+            return value
+    return ""
+
+
+def _parse(data: str) -> Dict[str, Any]:
+    """Structured chunk if the data is a JSON object, otherwise the raw text as a delta"""
+    try:
+        parsed = json.loads(data)
+    except ValueError:
+        return {"delta": data}
+    # Bare tokens like "true" or "42" are text, not JSON values
+    return parsed if isinstance(parsed, dict) else {"delta": data}
+
+
+async def iter_upstream_chunks(response: httpx.Response) -> AsyncIterator[Dict[str, Any]]:
+    """Yield the upstream reply as chunk dicts as soon as each one arrives"""
+    content_type = response.headers.get("content-type", "")
+
+    if content_type.startswith(STREAM_MEDIA_TYPES[SSE]):
+        data_lines = []
+        async for line in response.aiter_lines():
+            if line.startswith("data:"):
+                # Per the SSE spec only one leading space is stripped; token
+                # streams carry the word-separating spaces in the data
+                data = line[5:]
+                data_lines.append(data[1:] if data.startswith(" ") else data)
+            elif not line and data_lines:
+                data = "\n".join(data_lines)
+                data_lines = []
+                if data == "[DONE]":
+                    return
+                yield _parse(data)
+        if data_lines and data_lines != ["[DONE]"]:
+            yield _parse("\n".join(data_lines))
+
+    elif content_type.startswith(STREAM_MEDIA_TYPES[NDJSON]):
+        async for line in response.aiter_lines():
+            if line.strip():
+                yield _parse(line)
+
+    else:
+        # Non-streaming upstream: the whole reply is one chunk
+        yield _parse((await response.aread()).decode())
+
+
+class StreamStats:
+    """Counters and time-to-first-token for streamed replies"""
+
+    def __init__(self):
+        self.started = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.failed = 0
+        self.fallbacks = 0
+        self._first_token_total = 0.0
+        self._first_token_count = 0
+
+    def record_first_token(self, seconds: float):
+        self._first_token_total += seconds
+        self._first_token_count += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "started": self.started,
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "failed": self.failed,
+            "fallbacks": self.fallbacks,
+            "avg_time_to_first_token_ms": round(self._first_token_total / self._first_token_count * 1000, 1)
+            if self._first_token_count else None
+        }
@@ -0,0 +1,120 @@
+"""
+WebSocket connections with a bounded outbound queue and a writer task each,
+so replies are queued without waiting and one slow client can't stall others
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+from fastapi import WebSocket
+
+logger = logging.getLogger(__name__)
+
+# Close code for clients that don't keep up ("Try Again Later")
+SLOW_CONSUMER_CODE = 1013
+REPLACED_CODE = 1000
+
+
+class ClientConnection:
+    """One WebSocket whose frames are sent by its own writer task"""
+
+    def __init__(self, websocket: WebSocket, user_id: str, queue_size: int, send_timeout: float):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.send_timeout = send_timeout
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, queue_size))
+        self.closed = False
+        self.close_reason: Optional[str] = None
+        self.frames_sent = 0
+        self._writer = asyncio.ensure_future(self._write())
+
+    def send(self, message: str) -> bool:
+        """
+        Queue a frame without waiting. Slow-consumer policy: a full queue closes
+        the connection, since dropping frames would corrupt a streamed reply
+        """
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            self.abort(SLOW_CONSUMER_CODE, "slow consumer: outbound queue full")
+            return False
+
+    async def _write(self):
+        try:
+            while True:
+                message = await self.queue.get()
+                await asyncio.wait_for(self.websocket.send_text(message), self.send_timeout)
+                self.frames_sent += 1
+        except asyncio.TimeoutError:
+            self.abort(SLOW_CONSUMER_CODE, "slow consumer: send timed out")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # The client went away; the receive loop sees the disconnect
+            logger.debug(f"WebSocket send to {self.user_id} failed: {e}")
+            self.closed = True
+
+    def abort(self, code: int, reason: str):
+        """Stop sending and close the socket in the background"""
+        if self.closed:
+            return
+        self.closed = True
+        self.close_reason = reason
+        logger.warning(f"Closing WebSocket for user {self.user_id}: {reason}")
+        asyncio.ensure_future(self._close(code, reason))
+
+    async def _close(self, code: int, reason: str):
+        self._writer.cancel()
+        try:
+            await asyncio.wait_for(self.websocket.close(code=code, reason=reason), self.send_timeout)
+        except Exception:
+            pass
+
+    def stop(self):
+        self.closed = True
+        self._writer.cancel()
+
+
+class ConnectionManager:
+    """Active WebSocket connections by user id"""
+
+    def __init__(self, queue_size: int = 64, send_timeout: float = 10.0):
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self.active_connections: Dict[str, ClientConnection] = {}
+        self.slow_consumers = 0
+
+    async def connect(self, websocket: WebSocket, user_id: str) -> ClientConnection:
+        await websocket.accept()
+        previous = self.active_connections.get(user_id)
+        if previous is not None:
+            previous.abort(REPLACED_CODE, "replaced by a new connection")
+        connection = ClientConnection(websocket, user_id, self.queue_size, self.send_timeout)
+        self.active_connections[user_id] = connection
+        logger.info(f"WebSocket connected for user: {user_id}")
+        return connection
+
+    def disconnect(self, user_id: str, connection: ClientConnection):
+        if connection.close_reason and connection.close_reason.startswith("slow consumer"):
+            self.slow_consumers += 1
+        connection.stop()
+        if self.active_connections.get(user_id) is connection:
+            del self.active_connections[user_id]
+            logger.info(f"WebSocket disconnected for user: {user_id}")
+
+    def send_message(self, user_id: str, message: str) -> bool:
+        connection = self.active_connections.get(user_id)
+        return connection is not None and connection.send(message)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "connections": len(self.active_connections),
+            "queued_frames": sum(c.queue.qsize() for c in self.active_connections.values()),
+            "queue_size": self.queue_size,
+            "send_timeout": self.send_timeout,
+            "slow_consumers_closed": self.slow_consumers
+        }
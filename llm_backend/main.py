@@ -1,7 +1,7 @@
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 import uvicorn
 import os
 import json
@@ -10,12 +10,19 @@ import asyncio
 import tempfile
 import logging
 import httpx
-from typing import Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 from datetime import datetime
 # import speech_recognition as sr  # Disabled for Python 3.13 compatibility
 # import pyttsx3  # Disabled for Python 3.13 compatibility
 from pathlib import Path
 
+from backend_client import BackendClient
+from chat_stream import (NDJSON, STREAM_MEDIA_TYPES, UPSTREAM_ACCEPT, StreamStats, chunk_text, encode_event,
+                         iter_upstream_chunks, stream_format)
+from connection_manager import ConnectionManager
+from session_store import Session, SessionStore
+from upstream_health import HALF_OPEN, OPEN, CircuitBreaker, HealthProber
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -38,67 +45,122 @@ VOICE_DIR.mkdir(exist_ok=True)
 # Mount static files for voice serving
 app.mount("/api/voice", StaticFiles(directory=str(VOICE_DIR)), name="voice")
 
-# In-memory session storage (use Redis in production)
-sessions: Dict[str, Dict] = {}
+# In-memory session storage (use Redis in production); idle sessions expire and
+# the least recently active are evicted beyond LLM_MAX_SESSIONS
+sessions = SessionStore(
+    max_entries=int(os.getenv("LLM_MAX_SESSIONS", "100000")),
+    idle_ttl=float(os.getenv("LLM_SESSION_IDLE_TTL", "3600")),
+    history_size=int(os.getenv("LLM_SESSION_HISTORY", "10"))
+)
 
 # Backend client configuration
-BACKEND_CLIENT_URL = "https://mercy-tooth-jpg-attached.trycloudflare.com"
+BACKEND_CLIENT_URL = os.getenv("BACKEND_CLIENT_URL", "https://mercy-tooth-jpg-attached.trycloudflare.com")
 BACKEND_TIMEOUT = 30.0
+HEALTH_CHECK_TIMEOUT = 5.0
 
-# WebSocket connection manager
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: Dict[str, WebSocket] = {}
+# One pooled client for all upstream calls, so connections and their
+# TCP/TLS handshakes are reused across requests
+backend_client = BackendClient(
+    BACKEND_CLIENT_URL,
+    timeout=BACKEND_TIMEOUT,
+    connect_timeout=float(os.getenv("LLM_BACKEND_CONNECT_TIMEOUT", "5")),
+    max_connections=int(os.getenv("LLM_BACKEND_MAX_CONNECTIONS", "100")),
+    max_keepalive=int(os.getenv("LLM_BACKEND_MAX_KEEPALIVE", "20")),
+    keepalive_expiry=float(os.getenv("LLM_BACKEND_KEEPALIVE_EXPIRY", "60")),
+    http2=os.getenv("LLM_BACKEND_HTTP2", "true").lower() == "true"
+)
 
-    async def connect(self, websocket: WebSocket, user_id: str):
-        await websocket.accept()
-        self.active_connections[user_id] = websocket
-        logger.info(f"WebSocket connected for user: {user_id}")
+# Upstream state is kept current by a background prober and by the outcome of
+# real requests; /chat and /health only read it
+backend_breaker = CircuitBreaker(
+    failure_threshold=int(os.getenv("LLM_BREAKER_FAILURES", "3")),
+    reset_timeout=float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+)
 
-    def disconnect(self, user_id: str):
-        if user_id in self.active_connections:
-            del self.active_connections[user_id]
-            logger.info(f"WebSocket disconnected for user: {user_id}")
+@app.on_event("startup")
+async def start_backend_client():
+    await backend_client.start()
+    backend_prober.start()
 
-    async def send_message(self, user_id: str, message: str):
-        if user_id in self.active_connections:
-            await self.active_connections[user_id].send_text(message)
+@app.on_event("shutdown")
+async def close_backend_client():
+    await backend_prober.stop()
+    await backend_client.close()
 
-manager = ConnectionManager()
+# WebSocket connections; each has a bounded outbound queue and its own writer
+# task, and clients that fall behind are disconnected
+manager = ConnectionManager(
+    queue_size=int(os.getenv("LLM_WS_QUEUE_SIZE", "64")),
+    send_timeout=float(os.getenv("LLM_WS_SEND_TIMEOUT", "10"))
+)
 
-def get_session_context(session_id: str) -> Dict:
+def get_session_context(session_id: str) -> Session:
     """Get or create session context"""
-    if session_id not in sessions:
-        sessions[session_id] = {
-            "messages": [],
-            "created_at": datetime.now().isoformat(),
-            "last_activity": datetime.now().isoformat()
-        }
-    return sessions[session_id]
+    return sessions.get_or_create(session_id)
 
 def add_message_to_session(session_id: str, message: Dict):
-    """Add message to session context"""
-    context = get_session_context(session_id)
-    context["messages"].append({
-        "content": message["content"],
-        "type": message["type"],
-        "timestamp": datetime.now().isoformat(),
-        "is_user": message.get("is_user", True)
-    })
-    # Keep only last 10 messages for context
-    context["messages"] = context["messages"][-10:]
-    context["last_activity"] = datetime.now().isoformat()
+    """Add message to session context; only the last LLM_SESSION_HISTORY are kept"""
+    sessions.add_message(session_id, message["content"], message["type"], message.get("is_user", True))
 
 async def check_backend_availability() -> bool:
     """Check if the backend client is available"""
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(f"{BACKEND_CLIENT_URL}/health")
-            return response.status_code == 200
+        response = await backend_client.get("/health", timeout=HEALTH_CHECK_TIMEOUT)
+        return response.status_code == 200
     except Exception as e:
-        logger.warning(f"Backend client not available: {e}")
+        # Logged once per state change by the circuit breaker
+        logger.debug(f"Backend client not available: {e}")
         return False
 
+backend_prober = HealthProber(
+    check_backend_availability,
+    backend_breaker,
+    interval=float(os.getenv("LLM_BACKEND_PROBE_INTERVAL", "10"))
+)
+
+def validate_chat_request(type: str, audio: Optional[UploadFile]):
+    """Reject unsupported message types and voice messages without audio"""
+    if type not in ["text", "voice"]:
+        raise HTTPException(status_code=400, detail="Type must be 'text' or 'voice'")
+    
+    if type == "voice" and not audio:
+        raise HTTPException(status_code=400, detail="Audio file required for voice messages")
+    
+    if type == "voice" and audio.content_type and not audio.content_type.startswith("audio/"):
+        raise HTTPException(status_code=400, detail="File must be an audio file")
+
+async def build_backend_form(
+    message: str,
+    type: str,
+    sessionId: str,
+    userId: str,
+    username: str,
+    audio_file: Optional[UploadFile] = None
+) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    """Form fields and files for a chat request to the backend client"""
+    form_data = {
+        "message": message,
+        "type": type,
+        "sessionId": sessionId,
+        "userId": userId,
+        "username": username
+    }
+    
+    files = {}
+    if audio_file and type == "voice":
+        # Read audio file content
+        audio_content = await audio_file.read()
+        files["audio"] = (audio_file.filename or "audio.webm", audio_content, audio_file.content_type)
+    return form_data, files
+
+def record_backend_error(status_code: int):
+    """Feed a failed proxy attempt into the circuit breaker"""
+    # 4xx means the upstream is up but rejected this request
+    if status_code >= 500:
+        backend_breaker.record_failure()
+    else:
+        backend_breaker.record_success()
+
 async def proxy_to_backend_client(
     message: str,
     type: str,
@@ -109,35 +171,23 @@ async def proxy_to_backend_client(
 ) -> Dict:
     """Proxy request to the actual backend client"""
     try:
-        async with httpx.AsyncClient(timeout=BACKEND_TIMEOUT) as client:
-            # Prepare form data
-            form_data = {
-                "message": message,
-                "type": type,
-                "sessionId": sessionId,
-                "userId": userId,
-                "username": username
-            }
-            
-            files = {}
-            if audio_file and type == "voice":
-                # Read audio file content
-                audio_content = await audio_file.read()
-                files["audio"] = (audio_file.filename or "audio.webm", audio_content, audio_file.content_type)
-            
-            # Make request to backend client
-            response = await client.post(
-                f"{BACKEND_CLIENT_URL}/chat",
-                data=form_data,
-                files=files
-            )
+        form_data, files = await build_backend_form(message, type, sessionId, userId, username, audio_file)
+        
+        # Make request to backend client
+        response = await backend_client.post(
+            "/chat",
+            data=form_data,
+            files=files
+        )
+        
+        if response.status_code == 200:
+            return response.json()
+        else:
+            logger.error(f"Backend client error: {response.status_code} - {response.text}")
+            raise HTTPException(status_code=response.status_code, detail=f"Backend error: {response.text}")
             
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.error(f"Backend client error: {response.status_code} - {response.text}")
-                raise HTTPException(status_code=response.status_code, detail=f"Backend error: {response.text}")
-                
+    except HTTPException:
+        raise
     except httpx.TimeoutException:
         logger.error("Backend client timeout")
         raise HTTPException(status_code=504, detail="Backend client timeout")
@@ -168,12 +218,12 @@ async def text_to_speech(text: str) -> str:
         logger.error(f"Error creating TTS: {e}")
         return None
 
-async def generate_llm_response(message: str, session_context: Dict, user_id: str) -> str:
+async def generate_llm_response(message: str, session_context: Session, user_id: str) -> str:
     """Generate LLM response - replace with your actual LLM integration"""
     # This is a placeholder - replace with your actual LLM client
     # For now, we'll create a simple response based on the message
     
-    context_messages = session_context.get("messages", [])
+    context_messages = session_context.messages
     
     # Simple response logic (replace with your LLM)
     if "f1" in message.lower() or "formula" in message.lower():
@@ -187,15 +237,22 @@ async def generate_llm_response(message: str, session_context: Dict, user_id: st
 
 @app.get("/health")
 async def health_check():
-    backend_status = await check_backend_availability()
+    # Cached upstream state; this endpoint never calls the backend client itself
+    backend_status = backend_breaker.state != OPEN
     return {
         "status": "healthy", 
         "timestamp": datetime.now().isoformat(), 
         "service": "llm-chat-api",
         "backend_client": {
             "url": BACKEND_CLIENT_URL,
-            "available": backend_status
-        }
+            "available": backend_status,
+            "circuit": backend_breaker.stats(),
+            "probe": backend_prober.stats(),
+            "pool": backend_client.stats()
+        },
+        "chat_stream": stream_stats.stats(),
+        "websocket": manager.stats(),
+        "sessions": sessions.stats()
     }
 
 @app.post("/chat")
@@ -211,21 +268,12 @@ async def chat_endpoint(
     try:
         logger.info(f"Chat request - Type: {type}, User: {username}, Session: {sessionId}")
         
-        # Validate request
-        if type not in ["text", "voice"]:
-            raise HTTPException(status_code=400, detail="Type must be 'text' or 'voice'")
+        validate_chat_request(type, audio)
         
-        if type == "voice" and not audio:
-            raise HTTPException(status_code=400, detail="Audio file required for voice messages")
-        
-        if type == "voice" and audio.content_type and not audio.content_type.startswith("audio/"):
-            raise HTTPException(status_code=400, detail="File must be an audio file")
-        
-        # Check if backend client is available
-        backend_available = await check_backend_availability()
-        
-        if backend_available:
+        # Proxy or fall back based on the circuit breaker, without a round trip
+        if backend_breaker.allow_request():
             logger.info("Backend client available - proxying request")
+            trial = backend_breaker.state == HALF_OPEN
             try:
                 # Proxy to backend client
                 result = await proxy_to_backend_client(
@@ -236,6 +284,7 @@ async def chat_endpoint(
                     username=username,
                     audio_file=audio
                 )
+                backend_breaker.record_success()
                 
                 # Add messages to our session for tracking
                 add_message_to_session(sessionId, {
@@ -253,10 +302,16 @@ async def chat_endpoint(
                 
             except HTTPException as e:
                 logger.error(f"Backend client error: {e.detail}")
+                record_backend_error(e.status_code)
                 # Fall through to placeholder response
             except Exception as e:
                 logger.error(f"Unexpected error with backend client: {e}")
+                backend_breaker.record_failure()
                 # Fall through to placeholder response
+            finally:
+                # A cancelled trial records no outcome; don't keep the circuit half-open forever
+                if trial:
+                    backend_breaker.release_trial()
         
         # Fallback to placeholder implementation
         logger.info("Using placeholder implementation")
@@ -324,22 +379,202 @@ async def chat_endpoint(
         logger.error(f"Error processing chat request: {e}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+# Counters and time-to-first-token for /chat/stream
+stream_stats = StreamStats()
+
+async def stream_chat_reply(
+    fmt: str,
+    message: str,
+    type: str,
+    sessionId: str,
+    userId: str,
+    form_data: Dict[str, str],
+    files: Dict[str, Any],
+    audio: Optional[UploadFile]
+) -> AsyncIterator[bytes]:
+    """
+    Relay the backend client's reply chunk by chunk, or the placeholder reply
+    if the upstream is unavailable; the session history is updated once the
+    reply is complete. If the client disconnects, leaving the upstream stream
+    context closes the upstream request
+    """
+    started = time.perf_counter()
+    stream_stats.started += 1
+    parts = []
+    user_content = message
+    reply_type = type
+    audio_url = None
+    relayed = False
+    completed = False
+    
+    try:
+        if backend_breaker.allow_request():
+            trial = backend_breaker.state == HALF_OPEN
+            try:
+                async with backend_client.stream(
+                    "POST", "/chat", data=form_data, files=files, headers={"Accept": UPSTREAM_ACCEPT}
+                ) as response:
+                    if response.status_code != 200:
+                        body = (await response.aread()).decode(errors="replace")
+                        raise HTTPException(status_code=response.status_code, detail=f"Backend error: {body}")
+                    
+                    async for chunk in iter_upstream_chunks(response):
+                        reply_type = chunk.get("type", reply_type)
+                        audio_url = chunk.get("audioUrl", audio_url)
+                        delta = chunk_text(chunk)
+                        if not delta:
+                            continue
+                        if not parts:
+                            stream_stats.record_first_token(time.perf_counter() - started)
+                        parts.append(delta)
+                        yield encode_event(fmt, "delta", {"delta": delta})
+                backend_breaker.record_success()
+                relayed = True
+            except HTTPException as e:
+                logger.error(f"Backend client error while streaming: {e.detail}")
+                record_backend_error(e.status_code)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Transport errors, but also malformed chunks or a reset mid-stream
+                logger.error(f"Backend client stream failed: {e}")
+                backend_breaker.record_failure()
+            finally:
+                # The client may disconnect before the trial has an outcome
+                if trial:
+                    backend_breaker.release_trial()
+            
+            if not relayed and parts:
+                # Part of the reply was already sent; a fallback reply can't follow it
+                stream_stats.failed += 1
+                completed = True
+                yield encode_event(fmt, "error", {"detail": "Backend client stream interrupted"})
+                return
+        
+        if not relayed:
+            logger.info("Using placeholder implementation for streamed reply")
+            stream_stats.fallbacks += 1
+            if type == "voice":
+                user_content = await transcribe_audio(audio.file)
+            response_text = await generate_llm_response(user_content, get_session_context(sessionId), userId)
+            if type == "voice":
+                audio_url = await text_to_speech(response_text)
+            stream_stats.record_first_token(time.perf_counter() - started)
+            parts = [response_text]
+            yield encode_event(fmt, "delta", {"delta": response_text})
+        
+        reply = "".join(parts)
+        add_message_to_session(sessionId, {
+            "content": user_content,
+            "type": type,
+            "is_user": True
+        })
+        add_message_to_session(sessionId, {
+            "content": reply,
+            "type": reply_type,
+            "is_user": False
+        })
+        stream_stats.completed += 1
+        completed = True
+        yield encode_event(fmt, "done", {"message": reply, "type": reply_type, "audioUrl": audio_url})
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        # e.g. the placeholder reply failed; report it instead of counting a disconnect
+        logger.error(f"Streamed reply failed for session {sessionId}: {e}")
+        stream_stats.failed += 1
+        completed = True
+        yield encode_event(fmt, "error", {"detail": "Backend client stream interrupted"})
+    finally:
+        if not completed:
+            stream_stats.cancelled += 1
+            logger.info(f"Client disconnected from streamed reply for session {sessionId}")
+
+@app.post("/chat/stream")
+async def chat_stream_endpoint(
+    request: Request,
+    message: str = Form(...),
+    type: str = Form(...),
+    sessionId: str = Form(...),
+    userId: str = Form(...),
+    username: str = Form(...),
+    audio: Optional[UploadFile] = File(None)
+):
+    """
+    Streaming variant of /chat: reply chunks are sent as they arrive, as
+    Server-Sent Events (delta, done, error) or as NDJSON lines when the
+    client sends Accept: application/x-ndjson
+    """
+    logger.info(f"Streaming chat request - Type: {type}, User: {username}, Session: {sessionId}")
+    validate_chat_request(type, audio)
+    
+    fmt = stream_format(request.headers.get("accept"))
+    # Read the upload before the response starts
+    form_data, files = await build_backend_form(message, type, sessionId, userId, username, audio)
+    return StreamingResponse(
+        stream_chat_reply(fmt, message, type, sessionId, userId, form_data, files, audio),
+        media_type=STREAM_MEDIA_TYPES[fmt],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def parse_ws_message(data: str, user_id: str) -> Dict[str, str]:
+    """A WebSocket frame is plain text, or JSON with message and optional sessionId and username"""
+    if data.lstrip().startswith("{"):
+        try:
+            fields = json.loads(data)
+        except ValueError:
+            raise ValueError("Invalid JSON message")
+    else:
+        fields = {"message": data}
+    
+    message = fields.get("message")
+    if not isinstance(message, str) or not message.strip():
+        raise ValueError("Message must be non-empty text")
+    if fields.get("type", "text") != "text":
+        raise ValueError("Only text messages are supported over WebSocket; use /chat for voice")
+    return {
+        "message": message,
+        "sessionId": str(fields.get("sessionId") or user_id),
+        "username": str(fields.get("username") or user_id)
+    }
+
 @app.websocket("/ws/{user_id}")
 async def websocket_endpoint(websocket: WebSocket, user_id: str):
-    """WebSocket endpoint for real-time text communication"""
-    await manager.connect(websocket, user_id)
+    """
+    WebSocket chat with the same proxy/fallback pipeline as /chat/stream; each
+    reply goes out as JSON frames (delta, done, error) through the connection's
+    bounded queue
+    """
+    connection = await manager.connect(websocket, user_id)
     try:
-        while True:
+        while not connection.closed:
             # Receive message from client
             data = await websocket.receive_text()
-            logger.info(f"WebSocket message from {user_id}: {data}")
+            try:
+                request = parse_ws_message(data, user_id)
+            except ValueError as e:
+                connection.send(json.dumps({"event": "error", "detail": str(e)}))
+                continue
             
-            # Echo back for now (replace with your LLM processing)
-            response = f"Echo: {data}"
-            await manager.send_message(user_id, response)
+            logger.info(f"WebSocket message from {user_id}, session {request['sessionId']}")
+            form_data, files = await build_backend_form(
+                request["message"], "text", request["sessionId"], user_id, request["username"]
+            )
+            reply = stream_chat_reply(
+                NDJSON, request["message"], "text", request["sessionId"], user_id, form_data, files, None
+            )
+            try:
+                async for frame in reply:
+                    if not connection.send(frame.decode().rstrip("\n")):
+                        break
+            finally:
+                # Stops the upstream stream if the client fell behind or left
+                await reply.aclose()
             
     except WebSocketDisconnect:
-        manager.disconnect(user_id)
+        pass
+    finally:
+        manager.disconnect(user_id, connection)
 
 @app.get("/api/voice/{filename}")
 async def serve_voice_file(filename: str):
@@ -359,10 +594,11 @@ async def serve_voice_file(filename: str):
 @app.get("/sessions/{session_id}")
 async def get_session_info(session_id: str):
     """Get session information (for debugging)"""
-    if session_id not in sessions:
+    session = sessions.get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    return sessions[session_id]
+    return session.to_dict()
 
 if __name__ == "__main__":
     print("🤖 Starting Daredevil LLM Chat API...")
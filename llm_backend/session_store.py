@@ -0,0 +1,112 @@
+"""
+In-memory chat sessions with idle-TTL and max-entries eviction, and a
+fixed-size ring buffer of compact message records per session
+"""
+
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Optional
+
+
+class Message:
+    """One chat message; the timestamp is epoch seconds"""
+
+    __slots__ = ("content", "type", "timestamp", "is_user")
+
+    def __init__(self, content: str, type: str, timestamp: float, is_user: bool):
+        self.content = content
+        self.type = type
+        self.timestamp = timestamp
+        self.is_user = is_user
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "content": self.content,
+            "type": self.type,
+            "timestamp": datetime.fromtimestamp(self.timestamp).isoformat(),
+            "is_user": self.is_user
+        }
+
+
+class Session:
+    """The last history_size messages of a session; older ones drop off the ring buffer"""
+
+    __slots__ = ("messages", "created_at", "last_activity")
+
+    def __init__(self, history_size: int, now: float):
+        self.messages: Deque[Message] = deque(maxlen=history_size)
+        self.created_at = now
+        self.last_activity = now
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "messages": [message.to_dict() for message in self.messages],
+            "created_at": datetime.fromtimestamp(self.created_at).isoformat(),
+            "last_activity": datetime.fromtimestamp(self.last_activity).isoformat()
+        }
+
+
+class SessionStore:
+    """
+    Sessions by id, kept in least-recently-active order so idle and
+    over-capacity sessions are evicted from the front in O(1) each
+    """
+
+    def __init__(self, max_entries: int = 100000, idle_ttl: float = 3600.0, history_size: int = 10):
+        self.max_entries = max(1, max_entries)
+        self.idle_ttl = idle_ttl
+        self.history_size = max(1, history_size)
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self.evicted_idle = 0
+        self.evicted_capacity = 0
+
+    def _evict(self, now: float):
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_activity < self.idle_ttl:
+                break
+            self._sessions.popitem(last=False)
+            self.evicted_idle += 1
+        while len(self._sessions) > self.max_entries:
+            self._sessions.popitem(last=False)
+            self.evicted_capacity += 1
+
+    def get(self, session_id: str) -> Optional[Session]:
+        """The session, or None if it never existed or was evicted; does not count as activity"""
+        self._evict(time.time())
+        return self._sessions.get(session_id)
+
+    def get_or_create(self, session_id: str) -> Session:
+        now = time.time()
+        self._evict(now)
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = Session(self.history_size, now)
+            self._sessions[session_id] = session
+            self._evict(now)
+        else:
+            session.last_activity = now
+            self._sessions.move_to_end(session_id)
+        return session
+
+    def add_message(self, session_id: str, content: str, type: str, is_user: bool = True) -> Session:
+        session = self.get_or_create(session_id)
+        session.messages.append(Message(content, type, session.last_activity, is_user))
+        return session
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sessions": len(self._sessions),
+            "max_entries": self.max_entries,
+            "idle_ttl": self.idle_ttl,
+            "history_size": self.history_size,
+            "evicted_idle": self.evicted_idle,
+            "evicted_capacity": self.evicted_capacity
+        }
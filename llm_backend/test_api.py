@@ -1,5 +1,6 @@
 import requests
 import json
+from websockets.sync.client import connect
 
 def test_chat_api():
     """Test the chat API endpoint"""
@@ -54,7 +55,62 @@ def test_health():
     except Exception as e:
         print(f"💥 Exception: {e}")
 
+def test_chat_stream():
+    """Test the streaming chat endpoint"""
+    url = "http://127.0.0.1:8001/chat/stream"
+    
+    data = {
+        'message': 'Hello AI, can you help me with F1 predictions?',
+        'type': 'text',
+        'sessionId': 'test_session_123',
+        'userId': 'user_456',
+        'username': 'testuser'
+    }
+    
+    try:
+        print("🌊 Testing Streaming Chat Endpoint...")
+        with requests.post(url, data=data, stream=True) as response:
+            print(f"📊 Status Code: {response.status_code}")
+            if response.status_code != 200:
+                print("❌ Error!")
+                print(f"📄 Response: {response.text}")
+                return
+            
+            for line in response.iter_lines(decode_unicode=True):
+                if line:
+                    print(f"📨 {line}")
+            print("✅ Stream complete!")
+            
+    except Exception as e:
+        print(f"💥 Exception: {e}")
+
+def test_websocket_chat():
+    """Test chat over the WebSocket endpoint"""
+    url = "ws://127.0.0.1:8001/ws/user_456"
+    
+    try:
+        print("🔌 Testing WebSocket Chat...")
+        with connect(url) as websocket:
+            websocket.send(json.dumps({
+                'message': 'Hello AI, can you help me with F1 predictions?',
+                'sessionId': 'test_session_123',
+                'username': 'testuser'
+            }))
+            while True:
+                frame = json.loads(websocket.recv(timeout=30))
+                print(f"📨 {frame}")
+                if frame["event"] in ("done", "error"):
+                    break
+        print("✅ WebSocket reply complete!")
+            
+    except Exception as e:
+        print(f"💥 Exception: {e}")
+
 if __name__ == "__main__":
     test_health()
     print("\n" + "="*50 + "\n")
     test_chat_api()
+    print("\n" + "="*50 + "\n")
+    test_chat_stream()
+    print("\n" + "="*50 + "\n")
+    test_websocket_chat()
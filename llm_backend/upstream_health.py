@@ -0,0 +1,146 @@
+"""
+Upstream state for the backend client: a circuit breaker fed by real
+requests and a background prober, so /chat and /health never wait on a
+health check
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Closed: requests go upstream. Open after failure_threshold consecutive
+    failures: requests use the fallback. Half-open after reset_timeout: one
+    trial request goes upstream and its outcome closes or re-opens the circuit
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self.times_opened = 0
+        self.rejected = 0
+
+    def allow_request(self) -> bool:
+        """In-memory decision whether to send a request upstream"""
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+            self._trial_in_flight = False
+            logger.info("Backend circuit half-open; trying one request")
+
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def release_trial(self):
+        """
+        Free the half-open trial slot of a trial request that ended without an
+        outcome (e.g. it was cancelled), so the next request becomes the trial
+        """
+        if self.state == HALF_OPEN:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        if self.state != CLOSED:
+            logger.info("Backend circuit closed; upstream is healthy again")
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        if self.state == HALF_OPEN or (self.state == CLOSED and self.consecutive_failures >= self.failure_threshold):
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+            self.times_opened += 1
+            logger.warning(f"Backend circuit open after {self.consecutive_failures} consecutive failures")
+        elif self.state == OPEN:
+            # Probes keep failing; restart the wait before the next trial
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "reset_timeout": self.reset_timeout,
+            "open_for_seconds": round(time.monotonic() - self.opened_at, 1) if self.opened_at is not None else None,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected
+        }
+
+
+class HealthProber:
+    """Background task that probes the upstream every interval and feeds the breaker"""
+
+    def __init__(self, probe: Callable[[], Awaitable[bool]], breaker: CircuitBreaker, interval: float = 10.0):
+        self.probe = probe
+        self.breaker = breaker
+        self.interval = interval
+        self.last_ok: Optional[bool] = None
+        self.last_probe_at: Optional[float] = None
+        self.last_latency: Optional[float] = None
+        self.probes = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def probe_once(self) -> bool:
+        started = time.perf_counter()
+        try:
+            ok = await self.probe()
+        except Exception as e:
+            logger.debug(f"Backend probe failed: {e}")
+            ok = False
+        self.last_latency = time.perf_counter() - started
+        self.last_probe_at = time.time()
+        self.last_ok = ok
+        self.probes += 1
+        if ok:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+        return ok
+
+    async def _run(self):
+        while True:
+            await self.probe_once()
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "interval": self.interval,
+            "probes": self.probes,
+            "last_ok": self.last_ok,
+            "last_probe_age": round(time.time() - self.last_probe_at, 1) if self.last_probe_at is not None else None,
+            "last_latency_ms": round(self.last_latency * 1000, 1) if self.last_latency is not None else None
+        }
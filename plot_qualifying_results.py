@@ -2,95 +2,203 @@
 ==============================
 
 Plot the qualifying result with visualization the fastest times.
+
+Run without arguments to show the 2021 Spanish Grand Prix. With ``--season``
+the overview is rendered to files for every completed event of one or more
+seasons, spread across a process pool::
+
+    python plot_qualifying_results.py --season 2023 2024 --out charts
 """
 
 
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
 import matplotlib.pyplot as plt
-import pandas as pd
+from matplotlib.figure import Figure
 from timple.timedelta import strftimedelta
 
 import fastf1
 import fastf1.plotting
-from fastf1.core import Laps
 
+from f1_backend import qualifying
+from f1_backend.qualifying import fastest_laps_table, team_color_map
 
-# Enable Matplotlib patches for plotting timedelta values
-fastf1.plotting.setup_mpl(mpl_timedelta_support=True, color_scheme=None)
+# A chart goes stale when this script or the table pipeline it draws from changes
+CHART_SOURCES = (__file__, qualifying.__file__)
 
 
-session = fastf1.get_session(2021, 'Spanish Grand Prix', 'Q')
-session.load()
+def plot_qualifying(fig, session):
+    """Draw the qualifying overview of a loaded session onto fig"""
 
+    ##########################################################################
+    # We need each driver's fastest lap, sorted by lap time and numbered
+    # nicely by starting position. The shared pipeline in
+    # ``f1_backend/qualifying.py`` does this in one sort and de-duplication
+    # over the laps instead of filtering the laps once per driver.
+    #
+    # The plot is nicer to look at and more easily understandable if we just
+    # plot the time differences, so the table also has each lap's delta to
+    # the fastest lap time.
 
-##############################################################################
-# First, we need to get an array of all drivers.
+    fastest_laps = fastest_laps_table(session.laps)
+    pole_lap = fastest_laps.iloc[0]
 
-drivers = pd.unique(session.laps['Driver'])
-print(drivers)
+    ##########################################################################
+    # Finally, we'll create a list of team colors per lap to color our plot.
+    # Each team's color is looked up once and then mapped onto the laps.
+    team_colors = fastest_laps['Team'].map(
+        team_color_map(fastest_laps['Team'], session=session)).tolist()
 
+    ##########################################################################
+    # Now, we can plot all the data
+    ax = fig.subplots()
+    ax.barh(fastest_laps.index, fastest_laps['LapTimeDelta'],
+            color=team_colors, edgecolor='grey')
+    ax.set_yticks(fastest_laps.index)
+    ax.set_yticklabels(fastest_laps['Driver'])
 
-##############################################################################
-# After that we'll get each driver's fastest lap, create a new laps object
-# from these laps, sort them by lap time and have pandas reindex them to
-# number them nicely by starting position.
+    # show fastest at the top
+    ax.invert_yaxis()
 
-list_fastest_laps = list()
-for drv in drivers:
-    drvs_fastest_lap = session.laps.pick_drivers(drv).pick_fastest()
-    list_fastest_laps.append(drvs_fastest_lap)
-fastest_laps = Laps(list_fastest_laps) \
-    .sort_values(by='LapTime') \
-    .reset_index(drop=True)
+    # draw vertical lines behind the bars
+    ax.set_axisbelow(True)
+    ax.xaxis.grid(True, which='major', linestyle='--', color='black', zorder=-1000)
 
+    ##########################################################################
+    # Finally, give the plot a meaningful title
 
-##############################################################################
-# The plot is nicer to look at and more easily understandable if we just plot
-# the time differences. Therefore, we subtract the fastest lap time from all
-# other lap times.
+    lap_time_string = strftimedelta(pole_lap['LapTime'], '%m:%s.%ms')
 
-pole_lap = fastest_laps.pick_fastest()
-fastest_laps['LapTimeDelta'] = fastest_laps['LapTime'] - pole_lap['LapTime']
+    fig.suptitle(f"{session.event['EventName']} {session.event.year} Qualifying\n"
+                 f"Fastest Lap: {lap_time_string} ({pole_lap['Driver']})")
+    return fastest_laps
 
 
 ##############################################################################
-# We can take a quick look at the laps we have to check if everything
-# looks all right. For this, we'll just check the 'Driver', 'LapTime'
-# and 'LapTimeDelta' columns.
-
-print(fastest_laps[['Driver', 'LapTime', 'LapTimeDelta']])
-
-
-##############################################################################
-# Finally, we'll create a list of team colors per lap to color our plot.
-team_colors = list()
-for index, lap in fastest_laps.iterlaps():
-    color = fastf1.plotting.get_team_color(lap['Team'], session=session)
-    team_colors.append(color)
-
-
-##############################################################################
-# Now, we can plot all the data
-fig, ax = plt.subplots()
-ax.barh(fastest_laps.index, fastest_laps['LapTimeDelta'],
-        color=team_colors, edgecolor='grey')
-ax.set_yticks(fastest_laps.index)
-ax.set_yticklabels(fastest_laps['Driver'])
-
-# show fastest at the top
-ax.invert_yaxis()
-
-# draw vertical lines behind the bars
-ax.set_axisbelow(True)
-ax.xaxis.grid(True, which='major', linestyle='--', color='black', zorder=-1000)
-# sphinx_gallery_defer_figures
-
-
-##############################################################################
-# Finally, give the plot a meaningful title
-
-lap_time_string = strftimedelta(pole_lap['LapTime'], '%m:%s.%ms')
-
-plt.suptitle(f"{session.event['EventName']} {session.event.year} Qualifying\n"
-             f"Fastest Lap: {lap_time_string} ({pole_lap['Driver']})")
-
-plt.show()
+# Batch rendering
+# ---------------
+#
+# Each worker process loads one session (laps only; telemetry, weather and
+# race control messages are not needed for this plot) and writes the chart
+# with the Figure API, so no pyplot state is shared between events.
+
+def init_worker(cache_dir):
+    """Process pool initializer: FastF1 cache and Matplotlib patches"""
+    if cache_dir:
+        fastf1.Cache.enable_cache(cache_dir)
+    fastf1.plotting.setup_mpl(mpl_timedelta_support=True, color_scheme=None)
+
+
+def output_path(out_dir, year, round_number, event_name, fmt):
+    """<out>/<year>/<round>_<Event_Name>.<fmt>"""
+    return os.path.join(out_dir, str(year), f"{round_number:02d}_{event_name.replace(' ', '_')}.{fmt}")
+
+
+def is_current(path, event_date):
+    """
+    An output is current if it was written after the event took place and
+    after the last change to this script or to ``f1_backend/qualifying.py``
+    """
+    if not os.path.exists(path):
+        return False
+    rendered = os.path.getmtime(path)
+    return rendered > event_date.timestamp() and \
+        rendered > max(os.path.getmtime(source) for source in CHART_SOURCES)
+
+
+def render_event(year, round_number, path, fmt, dpi):
+    """Load one qualifying session and save its overview chart"""
+    session = fastf1.get_session(year, round_number, 'Q')
+    session.load(laps=True, telemetry=False, weather=False, messages=False)
+
+    fig = Figure(figsize=(8, 6), dpi=dpi)
+    plot_qualifying(fig, session)
+
+    # Write to a temporary name first so an interrupted run never leaves a
+    # truncated chart that would later count as current
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    fig.savefig(tmp_path, format=fmt)
+    os.replace(tmp_path, path)
+    return path
+
+
+def season_jobs(years, out_dir, fmt, force=False):
+    """(year, round, output path) for every completed event whose chart is missing or stale"""
+    now = datetime.now()
+    jobs, skipped = [], 0
+    for year in years:
+        schedule = fastf1.get_event_schedule(year, include_testing=False)
+        for _, event in schedule.iterrows():
+            event_date = event['EventDate'].to_pydatetime()
+            if event_date > now:
+                continue  # not run yet
+            path = output_path(out_dir, year, int(event['RoundNumber']), event['EventName'], fmt)
+            if not force and is_current(path, event_date):
+                skipped += 1
+                continue
+            jobs.append((year, int(event['RoundNumber']), path))
+    return jobs, skipped
+
+
+def render_seasons(years, out_dir, fmt='png', dpi=100, workers=None, cache_dir=None, force=False):
+    """Render every completed event of the given seasons in a process pool"""
+    jobs, skipped = season_jobs(years, out_dir, fmt, force=force)
+    print(f"{len(jobs)} charts to render, {skipped} already current")
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(cache_dir,)) as pool:
+        futures = {pool.submit(render_event, year, round_number, path, fmt, dpi): (year, round_number)
+                   for year, round_number, path in jobs}
+        for future in as_completed(futures):
+            year, round_number = futures[future]
+            try:
+                print(f"{year} round {round_number}: {future.result()}")
+            except Exception as e:
+                failed += 1
+                print(f"{year} round {round_number}: failed ({e})")
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--season", type=int, nargs="+",
+                        help="render every completed event of these seasons to files")
+    parser.add_argument("--out", default="qualifying_charts", help="output directory")
+    parser.add_argument("--format", default="png", choices=["png", "svg", "pdf"])
+    parser.add_argument("--dpi", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--cache", default=None, help="FastF1 cache directory")
+    parser.add_argument("--force", action="store_true", help="re-render charts that are already current")
+    args = parser.parse_args()
+
+    if args.season:
+        failed = render_seasons(args.season, args.out, fmt=args.format, dpi=args.dpi,
+                                workers=args.workers, cache_dir=args.cache, force=args.force)
+        raise SystemExit(1 if failed else 0)
+
+    # Enable Matplotlib patches for plotting timedelta values
+    init_worker(args.cache)
+
+    session = fastf1.get_session(2021, 'Spanish Grand Prix', 'Q')
+    session.load()
+
+    fig = plt.figure()
+    fastest_laps = plot_qualifying(fig, session)
+
+    ##########################################################################
+    # We can take a quick look at the laps we have to check if everything
+    # looks all right. For this, we'll just check the 'Driver', 'LapTime'
+    # and 'LapTimeDelta' columns.
+
+    print(fastest_laps[['Driver', 'LapTime', 'LapTimeDelta']])
+
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()